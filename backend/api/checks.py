@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def job_state_cache_check(app_configs, **kwargs):
+    # Job state (api/jobs.py) lives in the default cache, and status / stream polls
+    # can land on any worker, so more than one worker needs a shared backend
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if settings.DEBUG or not backend.endswith(".LocMemCache"):
+        return []
+    return [
+        Warning(
+            "Background job state (async disease detection, yield training) is kept in the "
+            "default cache, which is per-process locmem: polls that reach another worker get a 404.",
+            hint="Set REDIS_URL so all workers share job state, or run a single worker process.",
+            id="api.W001",
+        )
+    ]
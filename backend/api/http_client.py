@@ -0,0 +1,120 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+# Policy used for any client name without its own entry in settings.OUTBOUND_HTTP
+DEFAULT_POLICY = {
+    "timeout": 10,             # seconds, (connect, read) tuple also accepted
+    "retries": 2,              # retries after the first attempt
+    "backoff": 0.5,            # urllib3 exponential backoff factor
+    "retry_statuses": [502, 503, 504],
+    "retry_methods": ["GET", "HEAD"],
+    "respect_retry_after": True,  # a Retry-After header replaces the backoff sleep (uncapped)
+    "pool_maxsize": 16,        # keep-alive connections kept per host
+    "breaker_threshold": 5,    # consecutive failures before the circuit opens
+    "breaker_cooldown": 30,    # seconds to fail fast before a trial request
+}
+
+
+class CircuitBreaker:
+    # Opens after N consecutive failures so a slow or dead upstream fails fast
+    # instead of pinning every worker thread for the full timeout. After the
+    # cooldown one trial request is let through (half-open).
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self, host):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.cooldown:
+                raise CircuitOpenError(f"Circuit open for {host}; upstream is failing")
+            # Half-open: let this request through, fail fast for the others
+            self.opened_at = time.monotonic()
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class OutboundClient:
+    # Pooled session with timeout, retry/backoff and a circuit breaker per host
+
+    def __init__(self, name, **policy):
+        self.name = name
+        self.policy = {**DEFAULT_POLICY, **policy}
+        retry = Retry(
+            total=self.policy["retries"],
+            backoff_factor=self.policy["backoff"],
+            status_forcelist=self.policy["retry_statuses"],
+            allowed_methods=frozenset(m.upper() for m in self.policy["retry_methods"]),
+            respect_retry_after_header=self.policy["respect_retry_after"],
+            raise_on_status=False,  # hand the last response back to the caller
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.policy["pool_maxsize"], max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.policy["breaker_threshold"], self.policy["breaker_cooldown"]
+                )
+            return self._breakers[host]
+
+    def request(self, method, url, **kwargs):
+        host = urlparse(url).netloc
+        breaker = self._breaker(host)
+        breaker.before_request(host)
+        kwargs.setdefault("timeout", self.policy["timeout"])
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            breaker.record(ok=False)
+            raise
+        breaker.record(ok=response.status_code < 500)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(name):
+    # One long-lived client per integration, configured from settings.OUTBOUND_HTTP
+    with _CLIENTS_LOCK:
+        if name not in _CLIENTS:
+            policy = getattr(settings, "OUTBOUND_HTTP", {}).get(name, {})
+            _CLIENTS[name] = OutboundClient(name, **policy)
+        return _CLIENTS[name]
@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class FileLock:
+    # Non-blocking exclusive lock on a file, shared by every process on the host.
+    # The OS drops it when the holder exits, so a crashed worker can't leave it
+    # stuck, and unlike a cache key it can't be evicted while held. The file
+    # records the holder's job id.
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, owner):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, owner.encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        os.ftruncate(fd, 0)
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+    def owner(self):
+        try:
+            with open(self.path) as fh:
+                return fh.read() or None
+        except OSError:
+            return None
+
+
+class JobQueue:
+    # In-process background jobs with no external broker. Work runs on a small
+    # thread pool (the per-worker concurrency limit); job state lives in Django's
+    # cache, so with Redis configured any worker process can answer a poll. With
+    # the default locmem cache only the submitting worker knows a job, which is
+    # why `manage.py check` warns (api.W001) outside DEBUG.
+
+    TERMINAL = ("done", "failed")
+
+    def __init__(self, name, workers, max_pending, ttl, lock_path=None):
+        self.name = name
+        self.max_pending = max_pending
+        self.ttl = ttl
+        # lock_path: callable returning a lock file path; when set, at most one job
+        # runs at a time across all processes on the host
+        self.lock_path = lock_path
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-job")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _key(self, job_id):
+        return f"jobs:{self.name}:{job_id}"
+
+    def _save(self, job_id, state):
+        cache.set(self._key(job_id), state, timeout=self.ttl)
+
+    def get(self, job_id):
+        return cache.get(self._key(job_id))
+
+    def running_job(self):
+        # Id of the job holding the exclusive lock, if any
+        return FileLock(self.lock_path()).owner() if self.lock_path else None
+
+    def submit(self, fn, *args, on_error=None, progress=False):
+        # fn(*args) returns the JSON-serializable result; on_error(exc) turns an
+        # exception into the error dict stored on the job (None: generic error).
+        # With progress=True fn also gets progress=callable(**fields) to publish
+        # intermediate fields (stage, fraction done) on the job state.
+        job_id = uuid.uuid4().hex
+        lock = FileLock(self.lock_path()) if self.lock_path else None
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"{self.name} queue is full")
+            if lock and not lock.acquire(job_id):
+                raise QueueFullError(f"A {self.name} job is already running")
+            self._pending += 1
+
+        state = {"id": job_id, "status": "queued", "created_at": time.time()}
+        self._save(job_id, state)
+
+        def _report(**fields):
+            state.update(fields)
+            self._save(job_id, state)
+
+        def _run():
+            state.update(status="running", started_at=time.time())
+            self._save(job_id, state)
+            try:
+                kwargs = {"progress": _report} if progress else {}
+                state.update(status="done", result=fn(*args, **kwargs))
+                if progress:
+                    state["progress"] = 1.0
+            except Exception as exc:
+                error = on_error(exc) if on_error else None
+                state.update(status="failed", error=error or {"error": "Job failed", "details": str(exc)})
+            finally:
+                state["finished_at"] = time.time()
+                self._save(job_id, state)
+                if lock:
+                    lock.release()
+                with self._lock:
+                    self._pending -= 1
+
+        self._pool.submit(_run)
+        return job_id
+
+    def stats(self):
+        return {"pending": self._pending, "max_pending": self.max_pending}
+
+
+# Leaf disease inference: DISEASE_JOB_WORKERS bounds concurrent inferences per
+# process so local ONNX runs don't starve request threads of CPU
+disease_jobs = JobQueue(
+    "disease",
+    workers=getattr(settings, "DISEASE_JOB_WORKERS", 2),
+    max_pending=getattr(settings, "DISEASE_JOB_MAX_PENDING", 100),
+    ttl=getattr(settings, "DISEASE_JOB_TTL", 3600),
+)
+
+
+def _yield_training_lock_path():
+    from .ml.yield_model import training_lock_path
+    return training_lock_path()
+
+
+# Yield model training: one run at a time per artifact, in a child process
+# (api/ml/training.py)
+yield_training_jobs = JobQueue(
+    "yield-train",
+    workers=1,
+    max_pending=1,
+    ttl=getattr(settings, "YIELD_TRAINING_JOB_TTL", 7200),
+    lock_path=_yield_training_lock_path,
+)
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.ml import disease_model
+
+
+class Command(BaseCommand):
+    help = "Export the Hugging Face leaf disease ViT to ONNX for in-process CPU inference."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model-id", default=disease_model.MODEL_ID)
+        parser.add_argument("--output", default=str(disease_model.ONNX_PATH), help="Path of the .onnx file to write.")
+        parser.add_argument("--quantize", action="store_true", help="Also apply dynamic int8 quantization.")
+
+    def handle(self, *args, **options):
+        try:
+            import torch
+            from transformers import AutoImageProcessor, AutoModelForImageClassification
+        except ImportError:
+            raise CommandError("Exporting needs torch and transformers: pip install torch transformers")
+
+        output = Path(options["output"])
+        processor = AutoImageProcessor.from_pretrained(options["model_id"])
+        model = AutoModelForImageClassification.from_pretrained(options["model_id"]).eval()
+
+        size = processor.size.get("height", 224) if isinstance(processor.size, dict) else int(processor.size)
+        dummy = torch.zeros(1, 3, size, size)
+        torch.onnx.export(
+            model,
+            (dummy,),
+            str(output),
+            input_names=["pixel_values"],
+            output_names=["logits"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=17,
+        )
+
+        if options["quantize"]:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantized = output.with_suffix(".int8.onnx")
+            quantize_dynamic(str(output), str(quantized), weight_type=QuantType.QInt8)
+            quantized.replace(output)
+
+        # Labels and preprocessing constants read by disease_model.get_session()
+        config = {
+            "model_id": options["model_id"],
+            "labels": [model.config.id2label[i] for i in range(model.config.num_labels)],
+            "image_size": size,
+            "image_mean": list(processor.image_mean),
+            "image_std": list(processor.image_std),
+        }
+        with open(output.with_suffix(".json"), "w") as fh:
+            json.dump(config, fh, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['model_id']} -> {output}"))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.schemes import refresh_schemes
+
+
+class Command(BaseCommand):
+    help = "Scrape india.gov.in and upsert the stored government scheme catalog (run from cron, or with --every)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every", type=int, default=0, metavar="SECONDS",
+            help="Keep running and refresh every SECONDS, for deployments without cron.",
+        )
+
+    def handle(self, *args, **options):
+        every = options["every"]
+        if every < 0:
+            raise CommandError("--every must be a positive number of seconds")
+        if not every:
+            self._refresh()
+            return
+
+        # Scheduler mode: a failed refresh is reported and retried next round
+        while True:
+            try:
+                self._refresh()
+            except CommandError as exc:
+                self.stderr.write(self.style.ERROR(str(exc)))
+            time.sleep(every)
+
+    def _refresh(self):
+        try:
+            stats = refresh_schemes()
+        except Exception as exc:
+            raise CommandError(f"Could not refresh schemes: {exc}")
+        self.stdout.write(self.style.SUCCESS(
+            f"schemes: {stats['created']} new, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed; "
+            f"{stats['pages']} pages ({stats['not_modified']} not modified, {stats['failed']} failed)"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.ml import crop_model, fertilizer_model, yield_model
+
+
+class Command(BaseCommand):
+    help = "Build the crop, fertilizer and yield model artifacts offline so requests never train."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Retrain even if an artifact already exists.")
+        parser.add_argument("--skip-yield", action="store_true", help="Do not build the yield model.")
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        targets = [("crop", crop_model), ("fertilizer", fertilizer_model)]
+        if not options["skip_yield"]:
+            targets.append(("yield", yield_model))
+
+        for name, module in targets:
+            try:
+                result = module.train_and_save(force=force)
+            except FileNotFoundError as exc:
+                self.stderr.write(self.style.WARNING(f"{name}: skipped ({exc})"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"{name}: {result['status']} -> {result['model_path']}"))
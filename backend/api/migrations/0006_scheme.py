@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_userprofile_bio_userprofile_experience_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Scheme',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=300)),
+                ('description', models.TextField(blank=True)),
+                ('official_link', models.URLField(max_length=500, unique=True)),
+                ('department', models.CharField(default='Government of India', max_length=200)),
+                ('category', models.CharField(db_index=True, default='Agriculture', max_length=100)),
+                ('state', models.CharField(db_index=True, default='All India', max_length=100)),
+                ('eligibility', models.TextField(default='Check official link for details')),
+                ('benefits', models.JSONField(default=list)),
+                ('how_to_apply', models.TextField(default='Visit official website')),
+                ('helpline', models.CharField(default='N/A', max_length=50)),
+                ('email', models.CharField(default='N/A', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:37
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # GIN index and initial vectors only exist on Postgres; SQLite runs use the
+    # in-process index in api/scheme_search.py
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS api_scheme_search_gin ON api_scheme USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "UPDATE api_scheme SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS api_scheme_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_scheme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheme',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
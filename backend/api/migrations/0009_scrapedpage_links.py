@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+def forget_validators(apps, schema_editor):
+    # Pages stored before links were recorded would answer 304 with no links and
+    # get their schemes pruned; make the next refresh fetch and parse them all
+    ScrapedPage = apps.get_model('api', 'ScrapedPage')
+    ScrapedPage.objects.update(etag='', last_modified='', content_hash='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_incremental_scrape'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedpage',
+            name='pager_links',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='scrapedpage',
+            name='scheme_links',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(forget_validators, migrations.RunPython.noop),
+    ]
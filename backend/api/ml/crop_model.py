@@ -1,7 +1,7 @@
 import os
-from typing import Dict, Any, Tuple
+import threading
+from typing import Dict, Any, List, Tuple
 
-import joblib
 import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
@@ -11,8 +11,16 @@ from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
+from .forest_engine import ONLINE_MAX_ROWS, CompiledForest, compile_pipeline
+from .prediction_cache import PredictionCache
+from .runtime import apply_inference_policy, artifact_version, dump_atomic, inference_jobs, load_artifact, ml_setting
+
 
 _MODEL_SINGLETON: Tuple[Pipeline, Dict[str, Any]] | None = None
+_MODEL_LOCK = threading.Lock()
+_ENGINE_SINGLETON: CompiledForest | None = None
+_MODEL_VERSION = "unsaved"
+_PREDICTION_CACHE = PredictionCache("crop")
 
 
 def _get_data_path() -> str:
@@ -101,31 +109,65 @@ def _build_pipeline(df: pd.DataFrame) -> Tuple[Pipeline, Dict[str, Any]]:
     return pipeline, meta
 
 
-def _load_or_train() -> Tuple[Pipeline, Dict[str, Any]]:
+def train_and_save(force: bool = False) -> Dict[str, Any]:
+    cache_path = _get_cache_path()
+    if os.path.exists(cache_path) and not force:
+        return {"status": "exists", "model_path": cache_path}
+
+    df = _load_dataset()
+    pipeline, meta = _build_pipeline(df)
+    dump_atomic((pipeline, meta), cache_path)
+    return {"status": "trained", "accuracy": meta["accuracy"], "model_path": cache_path}
+
+
+def _load_or_train(train_if_missing: bool = True) -> Tuple[Pipeline, Dict[str, Any]]:
     cache_path = _get_cache_path()
     if os.path.exists(cache_path):
         try:
-            pipeline, meta = joblib.load(cache_path)
+            pipeline, meta = load_artifact(cache_path)
             return pipeline, meta
         except Exception:
             pass
 
+    if not train_if_missing:
+        raise FileNotFoundError(
+            f"Model artifact not found at {cache_path}. Build it first via `manage.py warm_models`."
+        )
+
     df = _load_dataset()
     pipeline, meta = _build_pipeline(df)
     try:
-        joblib.dump((pipeline, meta), cache_path)
+        dump_atomic((pipeline, meta), cache_path)
     except Exception:
         pass
     return pipeline, meta
 
 
-def get_model() -> Tuple[Pipeline, Dict[str, Any]]:
-    global _MODEL_SINGLETON
+def get_model(train_if_missing: bool | None = None) -> Tuple[Pipeline, Dict[str, Any]]:
+    global _MODEL_SINGLETON, _ENGINE_SINGLETON, _MODEL_VERSION
     if _MODEL_SINGLETON is None:
-        _MODEL_SINGLETON = _load_or_train()
+        # Serialize the first load so concurrent requests don't each load or train
+        with _MODEL_LOCK:
+            if _MODEL_SINGLETON is None:
+                if train_if_missing is None:
+                    train_if_missing = ml_setting("ML_TRAIN_ON_REQUEST", True)
+                pipeline, meta = _load_or_train(train_if_missing=train_if_missing)
+                apply_inference_policy(pipeline)
+                if ml_setting("ML_INFERENCE_ENGINE", "sklearn") == "flat":
+                    _ENGINE_SINGLETON = compile_pipeline(pipeline)
+                _MODEL_VERSION = artifact_version(_get_cache_path())
+                _MODEL_SINGLETON = (pipeline, meta)
     return _MODEL_SINGLETON
 
 
+def _predict_proba(pipeline: Pipeline, df: pd.DataFrame, batch: bool = False) -> np.ndarray:
+    # Use the flat-array engine for online-sized inputs when it was compiled
+    if _ENGINE_SINGLETON is not None and len(df) <= ONLINE_MAX_ROWS:
+        return _ENGINE_SINGLETON.predict_proba(df)
+    with inference_jobs(batch=batch):
+        return pipeline.predict_proba(df)
+
+
 def _coerce_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     def _get(keys, default=None):
         for k in keys:
@@ -154,11 +196,17 @@ def _coerce_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 def predict_crop_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     pipeline, meta = get_model()
-    features = _coerce_payload(payload)
+    features = _PREDICTION_CACHE.normalize(_coerce_payload(payload))
+    return _PREDICTION_CACHE.get_or_compute(
+        features, _MODEL_VERSION, lambda: _predict_features(pipeline, meta, features)
+    )
+
+
+def _predict_features(pipeline: Pipeline, meta: Dict[str, Any], features: Dict[str, Any]) -> Dict[str, Any]:
     df = pd.DataFrame([features])
 
     try:
-        proba = pipeline.predict_proba(df)[0]
+        proba = _predict_proba(pipeline, df)[0]
         classes = pipeline.named_steps["model"].classes_
         idx = int(np.argmax(proba))
         crop = str(classes[idx]).title()
@@ -177,3 +225,52 @@ def predict_crop_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _coerce_payloads(payloads: List[Dict[str, Any]], features: List[str]) -> np.ndarray:
+    # Stack every coerced row into one float matrix, columns in model feature order
+    matrix = np.empty((len(payloads), len(features)), dtype=np.float64)
+    for i, payload in enumerate(payloads):
+        if not isinstance(payload, dict):
+            raise ValueError(f"Item {i}: expected an object")
+        coerced = _coerce_payload(payload)
+        matrix[i] = [coerced[f] for f in features]
+    return matrix
+
+
+def predict_crops_from_payloads(payloads: List[Dict[str, Any]], top_k: int = 3) -> List[Dict[str, Any]]:
+    pipeline, meta = get_model()
+    features = meta.get("numeric_features") or list(_coerce_payload({}).keys())
+    if not payloads:
+        return []
+
+    matrix = _coerce_payloads(payloads, features)
+    df = pd.DataFrame(matrix, columns=features, copy=False)
+
+    # One forest evaluation for the whole batch
+    proba = _predict_proba(pipeline, df, batch=True)
+    classes = np.asarray(pipeline.named_steps["model"].classes_)
+    k = max(1, min(int(top_k), len(classes)))
+    # Top-k per row, highest probability first
+    top_idx = np.argsort(-proba, axis=1, kind="stable")[:, :k]
+    top_proba = np.take_along_axis(proba, top_idx, axis=1)
+
+    model_accuracy = round(meta.get("accuracy", 0.0) * 100, 2)
+    results = []
+    for i in range(len(payloads)):
+        top = [
+            {"crop": str(classes[j]).title(), "confidence": round(float(p) * 100, 2)}
+            for j, p in zip(top_idx[i], top_proba[i])
+        ]
+        results.append({
+            "crop": top[0]["crop"],
+            "confidence": top[0]["confidence"],
+            "top_k": top,
+            "meta": {
+                "model_accuracy": model_accuracy,
+                "used_features": {f: (None if np.isnan(v) else float(v)) for f, v in zip(features, matrix[i])},
+            },
+        })
+    return results
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _PREDICTION_CACHE.stats()
@@ -0,0 +1,280 @@
+import hashlib
+import io
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from .batcher import MicroBatcher
+from .runtime import artifact_version, ml_setting
+
+MODEL_ID = "wambugu71/crop_leaf_diseases_vit"
+HF_API_URL = f"https://api-inference.huggingface.co/models/{MODEL_ID}"
+
+MODEL_DIR = Path(__file__).resolve().parent
+# Written by `manage.py export_disease_model`
+ONNX_PATH = MODEL_DIR / "disease_model.onnx"
+CONFIG_PATH = MODEL_DIR / "disease_model.json"
+
+# The hosted API answers with the top 5 labels; the local backend matches it
+TOP_K = 5
+
+_SESSION_SINGLETON = None
+_SESSION_LOCK = threading.Lock()
+_BATCHER_SINGLETON = None
+
+
+class InferenceError(Exception):
+    # status is the HTTP status to answer with; upstream_status what the hosted API returned
+    def __init__(self, message: str, status: int = 502, upstream_status: int | None = None, details: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.upstream_status = upstream_status
+        self.details = details
+
+
+def _onnx_path() -> Path:
+    return Path(ml_setting("DISEASE_ONNX_PATH", None) or ONNX_PATH)
+
+
+def _config_path() -> Path:
+    return _onnx_path().with_suffix(".json")
+
+
+def local_available() -> bool:
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return _onnx_path().exists() and _config_path().exists()
+
+
+def active_backend() -> str:
+    # "local" runs the exported ONNX model in-process, "remote" the HF inference
+    # API; "auto" prefers local whenever the runtime and artifact are present
+    backend = ml_setting("DISEASE_BACKEND", "auto")
+    if backend == "auto":
+        return "local" if local_available() else "remote"
+    return backend
+
+
+def get_session():
+    # One warm ONNX Runtime session per process, shared by all request threads
+    global _SESSION_SINGLETON
+    if _SESSION_SINGLETON is None:
+        with _SESSION_LOCK:
+            if _SESSION_SINGLETON is None:
+                import onnxruntime as ort
+
+                with open(_config_path()) as fh:
+                    config = json.load(fh)
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                options.intra_op_num_threads = int(ml_setting("DISEASE_ONNX_THREADS", 0))
+                session = ort.InferenceSession(
+                    str(_onnx_path()), sess_options=options, providers=["CPUExecutionProvider"]
+                )
+                # First run allocates and plans the graph; keep it off the request path
+                size = config["image_size"]
+                session.run(None, {session.get_inputs()[0].name: np.zeros((1, 3, size, size), np.float32)})
+                _SESSION_SINGLETON = (session, config)
+    return _SESSION_SINGLETON
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    # Transparent pixels (RGBA/LA PNGs, palette GIFs) are flattened onto white
+    # rather than whatever colour happens to sit under the alpha channel
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        rgba = image.convert("RGBA")
+        flat = Image.new("RGB", rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel("A"))
+        return flat
+    return image.convert("RGB")
+
+
+def prepare_image(source: Any, size: int) -> Image.Image:
+    # Decode a phone photo (bytes or file object) straight down to a size x size RGB
+    # square: JPEG draft mode lets libjpeg decode at 1/2..1/8 scale, other formats
+    # are shrunk with reduce() before the center crop and the final resize
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    image = Image.open(source)
+    image.draft("RGB", (size, size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "L"):
+        # reduce() rejects palette, CMYK and 16-bit modes
+        image = _to_rgb(image)
+
+    factor = min(image.size) // size
+    if factor >= 2 and image.format != "JPEG":
+        image = image.reduce(factor)
+    image = image.convert("RGB")
+
+    side = min(image.size)
+    left, top = (image.width - side) // 2, (image.height - side) // 2
+    image = image.crop((left, top, left + side, top + side))
+    return image.resize((size, size), Image.BILINEAR)
+
+
+def encode_jpeg(image: Image.Image) -> bytes:
+    # Compact re-encode of the prepared square for the hosted API (a few KB)
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=90, optimize=True)
+    return buf.getvalue()
+
+
+def to_pixels(image: Image.Image, config: Dict[str, Any]) -> np.ndarray:
+    # Rescale and normalize like the model's ViTImageProcessor, channels first
+    pixels = np.asarray(image, dtype=np.float32) / 255.0
+    pixels = (pixels - np.asarray(config["image_mean"], np.float32)) / np.asarray(config["image_std"], np.float32)
+    return pixels.transpose(2, 0, 1)
+
+
+def _top_k(logits: np.ndarray, labels: List[str]) -> List[List[Dict[str, Any]]]:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    proba = exp / exp.sum(axis=1, keepdims=True)
+    order = np.argsort(-proba, axis=1)[:, :TOP_K]
+    return [
+        [{"label": labels[j], "score": float(proba[i, j])} for j in order[i]]
+        for i in range(len(proba))
+    ]
+
+
+def predict_local(images: List[Image.Image]) -> List[List[Dict[str, Any]]]:
+    # Images as returned by prepare_image() at the model's image_size
+    session, config = get_session()
+    batch = np.stack([to_pixels(image, config) for image in images])
+    logits = session.run(None, {session.get_inputs()[0].name: batch})[0]
+    return _top_k(logits, config["labels"])
+
+
+def get_batcher() -> MicroBatcher | None:
+    # Concurrent local requests share forward passes: up to DISEASE_BATCH_MAX_SIZE
+    # images, waiting at most DISEASE_BATCH_MAX_WAIT_MS. A max size of 1 disables it.
+    global _BATCHER_SINGLETON
+    max_batch = int(ml_setting("DISEASE_BATCH_MAX_SIZE", 1))
+    if max_batch <= 1:
+        return None
+    if _BATCHER_SINGLETON is None:
+        with _SESSION_LOCK:
+            if _BATCHER_SINGLETON is None:
+                _BATCHER_SINGLETON = MicroBatcher(
+                    predict_local, max_batch, float(ml_setting("DISEASE_BATCH_MAX_WAIT_MS", 5)),
+                    name="disease-batcher",
+                )
+    return _BATCHER_SINGLETON
+
+
+def current_batcher() -> MicroBatcher | None:
+    # The batcher if a request already started it (for stats, no side effects)
+    return _BATCHER_SINGLETON
+
+
+def image_size() -> int:
+    if active_backend() == "local":
+        return get_session()[1]["image_size"]
+    return int(ml_setting("DISEASE_IMAGE_SIZE", 224))
+
+
+def predict_remote(image_bytes: bytes) -> List[Dict[str, Any]]:
+    from ..http_client import CircuitOpenError, get_client
+
+    token = ml_setting("HF_API_TOKEN", None)
+    if not token:
+        raise InferenceError("HF_API_TOKEN missing in server configuration.", status=400)
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json",
+        "Content-Type": "image/jpeg",
+    }
+    # Retries on 503 (model cold start) with backoff are handled by the client policy
+    try:
+        r = get_client("huggingface").post(HF_API_URL, headers=headers, data=image_bytes)
+    except CircuitOpenError as exc:
+        raise InferenceError("Inference temporarily unavailable", status=503, details=str(exc))
+    except Exception as exc:
+        raise InferenceError("Inference failed", details=str(exc))
+    try:
+        response_json = r.json()
+    except Exception:
+        response_json = None
+    if not isinstance(response_json, list):
+        raise InferenceError("Inference failed", upstream_status=r.status_code, details=response_json)
+    return response_json
+
+
+def prepare(source: Any) -> Image.Image:
+    # Resolved outside the try: a missing runtime or model is a server error, not a bad upload
+    size = image_size()
+    try:
+        return prepare_image(source, size)
+    except Exception as exc:
+        raise InferenceError("Could not decode image", status=400, details=str(exc))
+
+
+def _dhash(image: Image.Image) -> int:
+    # 64-bit difference hash: brighter-than-right-neighbour bits of a 9x8 thumbnail
+    gray = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    return int.from_bytes(np.packbits((gray[:, 1:] > gray[:, :-1]).ravel()).tobytes(), "big")
+
+
+# Recently seen dHashes, so a re-compressed copy that flips a few bits still maps to
+# the first upload's key. Per process; exact hash matches are shared across workers
+# through the cache itself.
+_DHASH_RING = np.zeros(4096, dtype=np.uint64)
+_DHASH_COUNT = 0
+_DHASH_LOCK = threading.Lock()
+
+
+def _canonical_dhash(value: int) -> int:
+    global _DHASH_COUNT
+    max_distance = int(ml_setting("DISEASE_CACHE_PERCEPTUAL_DISTANCE", 4))
+    with _DHASH_LOCK:
+        seen = _DHASH_RING[:min(_DHASH_COUNT, len(_DHASH_RING))]
+        if seen.size:
+            diff = np.bitwise_xor(seen, np.uint64(value))
+            distance = np.unpackbits(diff.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+            nearest = int(np.argmin(distance))
+            if distance[nearest] <= max_distance:
+                return int(seen[nearest])
+        _DHASH_RING[_DHASH_COUNT % len(_DHASH_RING)] = value
+        _DHASH_COUNT += 1
+    return value
+
+
+def image_key(image: Image.Image) -> str:
+    # Digest of the prepared pixels, so re-uploads of the same photo match whatever
+    # the original file size or metadata. With DISEASE_CACHE_PERCEPTUAL a dHash
+    # within a few bits of an earlier upload is used instead, which also matches
+    # re-compressed or resized copies (e.g. photos forwarded through messaging apps).
+    if ml_setting("DISEASE_CACHE_PERCEPTUAL", False):
+        return f"dhash:{_canonical_dhash(_dhash(image)):016x}"
+    return "sha1:" + hashlib.sha1(image.tobytes()).hexdigest()
+
+
+def model_version() -> str:
+    # Part of the result cache key: a re-exported ONNX model invalidates old entries
+    if active_backend() == "local":
+        return "local-" + artifact_version(_onnx_path())
+    return "remote-" + MODEL_ID
+
+
+def classify_image(image: Image.Image) -> List[Dict[str, Any]]:
+    # Top predictions as [{"label", "score"}], same shape as the HF inference API
+    if active_backend() == "local":
+        try:
+            batcher = get_batcher()
+            return batcher.submit(image) if batcher else predict_local([image])[0]
+        except Exception:
+            # Broken local runtime: fall back to the hosted API when it is configured
+            if not ml_setting("HF_API_TOKEN", None):
+                raise
+    return predict_remote(encode_jpeg(image))
+
+
+def classify(source: Any) -> List[Dict[str, Any]]:
+    # source is the uploaded file object or raw bytes
+    return classify_image(prepare(source))
@@ -1,7 +1,7 @@
 import os
-from typing import Dict, Any, Tuple
+import threading
+from typing import Dict, Any, Iterator, List, Tuple
 
-import joblib
 import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
@@ -12,8 +12,47 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
 
+from .forest_engine import ONLINE_MAX_ROWS, CompiledForest, compile_pipeline
+from .prediction_cache import PredictionCache
+from .runtime import apply_inference_policy, artifact_version, dump_atomic, inference_jobs, load_artifact, ml_setting
+
 
 _MODEL_SINGLETON: Tuple[Pipeline, Dict[str, Any]] | None = None
+_MODEL_LOCK = threading.Lock()
+_ENGINE_SINGLETON: CompiledForest | None = None
+_MODEL_VERSION = "unsaved"
+_PREDICTION_CACHE = PredictionCache("fertilizer")
+
+# Simple heuristic dosage suggestion by fertilizer type
+BASE_DOSAGE = {
+    "Urea": 100,
+    "DAP": 80,
+    "20-20": 90,
+    "28-28": 90,
+    "17-17-17": 90,
+    "14-35-14": 70,
+    "10-26-26": 70,
+}
+DEFAULT_DOSAGE = 90
+
+# Accepted key variants per model column, shared by single and batch coercion
+_NUMERIC_KEYS = {
+    "Temperature": ["temperature", "temp", "Temperature"],
+    "Humidity": ["humidity", "Humidity"],
+    "Moisture": ["moisture", "Moisture"],
+    "Nitrogen": ["nitrogen", "N", "Nitrogen"],
+    "Potassium": ["potassium", "K", "Potassium"],
+    "Phosphorus": ["phosphorus", "phosphorous", "P", "Phosphorus"],
+}
+_CATEGORICAL_KEYS = {
+    "SoilType": ["soil", "soil_type", "SoilType"],
+    "CropType": ["crop", "crop_type", "CropType"],
+}
+_NUMERIC_DEFAULTS = {
+    "Temperature": 30.0,
+    "Humidity": 60.0,
+    "Moisture": 40.0,
+}
 
 
 def _get_data_path() -> str:
@@ -118,32 +157,66 @@ def _build_pipeline(df: pd.DataFrame) -> Tuple[Pipeline, Dict[str, Any]]:
     return pipeline, meta
 
 
-def _load_or_train() -> Tuple[Pipeline, Dict[str, Any]]:
+def train_and_save(force: bool = False) -> Dict[str, Any]:
+    cache_path = _get_cache_path()
+    if os.path.exists(cache_path) and not force:
+        return {"status": "exists", "model_path": cache_path}
+
+    df = _load_dataset()
+    pipeline, meta = _build_pipeline(df)
+    dump_atomic((pipeline, meta), cache_path)
+    return {"status": "trained", "accuracy": meta["accuracy"], "model_path": cache_path}
+
+
+def _load_or_train(train_if_missing: bool = True) -> Tuple[Pipeline, Dict[str, Any]]:
     cache_path = _get_cache_path()
     if os.path.exists(cache_path):
         try:
-            pipeline, meta = joblib.load(cache_path)
+            pipeline, meta = load_artifact(cache_path)
             return pipeline, meta
         except Exception:
             pass
 
+    if not train_if_missing:
+        raise FileNotFoundError(
+            f"Model artifact not found at {cache_path}. Build it first via `manage.py warm_models`."
+        )
+
     df = _load_dataset()
     pipeline, meta = _build_pipeline(df)
     try:
-        joblib.dump((pipeline, meta), cache_path)
+        dump_atomic((pipeline, meta), cache_path)
     except Exception:
         # Non-fatal if caching fails
         pass
     return pipeline, meta
 
 
-def get_model() -> Tuple[Pipeline, Dict[str, Any]]:
-    global _MODEL_SINGLETON
+def get_model(train_if_missing: bool | None = None) -> Tuple[Pipeline, Dict[str, Any]]:
+    global _MODEL_SINGLETON, _ENGINE_SINGLETON, _MODEL_VERSION
     if _MODEL_SINGLETON is None:
-        _MODEL_SINGLETON = _load_or_train()
+        # Serialize the first load so concurrent requests don't each load or train
+        with _MODEL_LOCK:
+            if _MODEL_SINGLETON is None:
+                if train_if_missing is None:
+                    train_if_missing = ml_setting("ML_TRAIN_ON_REQUEST", True)
+                pipeline, meta = _load_or_train(train_if_missing=train_if_missing)
+                apply_inference_policy(pipeline)
+                if ml_setting("ML_INFERENCE_ENGINE", "sklearn") == "flat":
+                    _ENGINE_SINGLETON = compile_pipeline(pipeline)
+                _MODEL_VERSION = artifact_version(_get_cache_path())
+                _MODEL_SINGLETON = (pipeline, meta)
     return _MODEL_SINGLETON
 
 
+def _predict_proba(pipeline: Pipeline, df: pd.DataFrame, batch: bool = False) -> np.ndarray:
+    # Use the flat-array engine for online-sized inputs when it was compiled
+    if _ENGINE_SINGLETON is not None and len(df) <= ONLINE_MAX_ROWS:
+        return _ENGINE_SINGLETON.predict_proba(df)
+    with inference_jobs(batch=batch):
+        return pipeline.predict_proba(df)
+
+
 def _coerce_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     # Accept multiple key variants from frontend and coerce types
     def _get(keys, default=None):
@@ -152,44 +225,45 @@ def _coerce_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
                 return payload[k]
         return default
 
-    crop = _get(["crop", "crop_type", "CropType"]) or ""
-    soil = _get(["soil", "soil_type", "SoilType"]) or ""
-
     def _to_float(v):
         try:
             return float(v)
         except Exception:
             return np.nan
 
-    coerced = {
-        "Temperature": _to_float(_get(["temperature", "temp", "Temperature"])),
-        "Humidity": _to_float(_get(["humidity", "Humidity"])),
-        "Moisture": _to_float(_get(["moisture", "Moisture"])),
-        "Nitrogen": _to_float(_get(["nitrogen", "N", "Nitrogen"])),
-        "Potassium": _to_float(_get(["potassium", "K", "Potassium"])),
-        "Phosphorus": _to_float(_get(["phosphorus", "phosphorous", "P", "Phosphorus"])),
-        "SoilType": str(soil).strip().title() if soil else None,
-        "CropType": str(crop).strip().title() if crop else None,
-    }
+    coerced: Dict[str, Any] = {col: _to_float(_get(keys)) for col, keys in _NUMERIC_KEYS.items()}
+    for col, keys in _CATEGORICAL_KEYS.items():
+        value = _get(keys) or ""
+        coerced[col] = str(value).strip().title() if value else None
 
     # Minimal defaults if some optional fields are missing, to work with UI sending only NPK + crop
-    if pd.isna(coerced["Temperature"]):
-        coerced["Temperature"] = 30.0
-    if pd.isna(coerced["Humidity"]):
-        coerced["Humidity"] = 60.0
-    if pd.isna(coerced["Moisture"]):
-        coerced["Moisture"] = 40.0
+    for col, default in _NUMERIC_DEFAULTS.items():
+        if pd.isna(coerced[col]):
+            coerced[col] = default
 
     return coerced
 
 
+def _base_dosage_for(fertilizer: str) -> int:
+    for key, val in BASE_DOSAGE.items():
+        if key.lower() in fertilizer.lower():
+            return val
+    return DEFAULT_DOSAGE
+
+
 def predict_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     pipeline, meta = get_model()
-    features = _coerce_payload(payload)
+    features = _PREDICTION_CACHE.normalize(_coerce_payload(payload))
+    return _PREDICTION_CACHE.get_or_compute(
+        features, _MODEL_VERSION, lambda: _predict_features(pipeline, meta, features)
+    )
+
+
+def _predict_features(pipeline: Pipeline, meta: Dict[str, Any], features: Dict[str, Any]) -> Dict[str, Any]:
     df = pd.DataFrame([features])
     proba = None
     try:
-        proba = pipeline.predict_proba(df)[0]
+        proba = _predict_proba(pipeline, df)[0]
         classes = pipeline.named_steps["model"].classes_
         idx = int(np.argmax(proba))
         fertilizer = str(classes[idx])
@@ -198,23 +272,8 @@ def predict_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
         fertilizer = str(pipeline.predict(df)[0])
         confidence = 0.0
 
-    # Simple heuristic dosage suggestion by fertilizer type
-    base_dosage = {
-        "Urea": 100,
-        "DAP": 80,
-        "20-20": 90,
-        "28-28": 90,
-        "17-17-17": 90,
-        "14-35-14": 70,
-        "10-26-26": 70,
-    }
-
-    suggested = 90
+    suggested = _base_dosage_for(fertilizer)
     method = "Basal dose"
-    for key, val in base_dosage.items():
-        if key.lower() in fertilizer.lower():
-            suggested = val
-            break
 
     # Adjust dosage a bit by nitrogen deficit/excess
     nitrogen = features.get("Nitrogen") or 0.0
@@ -237,3 +296,87 @@ def predict_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     return response
 
 
+def _check_payloads(payloads: List[Any]) -> None:
+    # Batch items must be objects; anything else would score as an all-default row
+    for i, payload in enumerate(payloads):
+        if not isinstance(payload, dict):
+            raise ValueError(f"Item {i}: expected an object")
+
+
+def _pick(payload: Dict[str, Any], keys: List[str]) -> Any:
+    for k in keys:
+        v = payload.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+def _coerce_payloads(payloads: List[Dict[str, Any]]) -> pd.DataFrame:
+    # Column-wise equivalent of _coerce_payload: one pass per column, vectorized casts
+    columns: Dict[str, Any] = {}
+    for col, keys in _NUMERIC_KEYS.items():
+        raw = pd.Series([_pick(p, keys) for p in payloads], dtype=object)
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+        if col in _NUMERIC_DEFAULTS:
+            values[np.isnan(values)] = _NUMERIC_DEFAULTS[col]
+        columns[col] = values
+    for col, keys in _CATEGORICAL_KEYS.items():
+        raw = pd.Series([_pick(p, keys) or None for p in payloads], dtype=object)
+        columns[col] = raw.where(raw.isna(), raw.astype(str).str.strip().str.title())
+    return pd.DataFrame(columns)
+
+
+def _dosage_lookup(classes: np.ndarray) -> np.ndarray:
+    # Resolve the substring heuristic once per class instead of once per row
+    return np.array([_base_dosage_for(str(c)) for c in classes], dtype=np.int64)
+
+
+def predict_from_payloads(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    pipeline, meta = get_model()
+    if not payloads:
+        return []
+
+    _check_payloads(payloads)
+    df = _coerce_payloads(payloads)
+    proba = _predict_proba(pipeline, df, batch=True)
+    classes = np.asarray(pipeline.named_steps["model"].classes_)
+    idx = np.argmax(proba, axis=1)
+    confidence = proba[np.arange(len(idx)), idx]
+
+    # Same nitrogen adjustment and clamp as the single-row path
+    suggested = _dosage_lookup(classes)[idx]
+    nitrogen = df["Nitrogen"].to_numpy()
+    suggested = suggested + np.where(nitrogen < 15, 20, np.where(nitrogen > 35, -10, 0))
+    suggested = np.clip(suggested, 40, 200)
+
+    model_accuracy = round(meta.get("accuracy", 0.0) * 100, 2)
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    return [
+        {
+            "fertilizer": str(classes[idx[i]]),
+            "confidence": round(float(confidence[i]) * 100, 2),
+            "dosage_kg_per_acre": int(suggested[i]),
+            "application_method": "Basal dose",
+            "meta": {
+                "model_accuracy": model_accuracy,
+                "used_features": records[i],
+            },
+        }
+        for i in range(len(payloads))
+    ]
+
+
+def iter_predictions_from_payloads(payloads: List[Dict[str, Any]], chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    # Validated eagerly (this is not a generator), so a bad item is reported
+    # before a streaming response starts; then scored in fixed-size chunks so
+    # the stream can flush early
+    _check_payloads(payloads)
+    return (
+        row
+        for start in range(0, len(payloads), chunk_size)
+        for row in predict_from_payloads(payloads[start:start + chunk_size])
+    )
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _PREDICTION_CACHE.stats()
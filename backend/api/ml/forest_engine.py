@@ -0,0 +1,119 @@
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+from sklearn.pipeline import Pipeline
+
+# Beyond roughly this many rows sklearn's compiled tree loops overtake the numpy
+# traversal, so large batches keep going through the Pipeline
+ONLINE_MAX_ROWS = 128
+
+
+class CompiledForest:
+    # Flat-array export of a fitted forest Pipeline ("preprocess" + final estimator).
+    # All trees are concatenated into one set of node arrays and evaluated with a
+    # vectorized level-by-level traversal, so a prediction is a handful of numpy
+    # gathers with no joblib thread pool spun up per call.
+
+    CHUNK_ROWS = 128
+
+    def __init__(self, pipeline: Pipeline):
+        self.preprocess = pipeline.steps[0][1]
+        forest = pipeline.steps[-1][1]
+        self.is_classifier = hasattr(forest, "classes_")
+        self.classes_ = getattr(forest, "classes_", None)
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for est in forest.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            leaf = tree.children_left == -1
+            idx = np.arange(offset, offset + n, dtype=np.int32)
+
+            # Leaves point at themselves so extra traversal steps are no-ops
+            features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(leaf, 0.0, tree.threshold))
+            lefts.append(np.where(leaf, idx, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(leaf, idx, tree.children_right + offset).astype(np.int32))
+
+            value = tree.value[:, 0, :].astype(np.float64)
+            if self.is_classifier:
+                # Same per-tree normalization as DecisionTreeClassifier.predict_proba
+                totals = value.sum(axis=1, keepdims=True)
+                totals[totals == 0.0] = 1.0
+                value = value / totals
+            values.append(value)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n
+
+        self.feature = np.concatenate(features).astype(np.int64)
+        self.threshold = np.concatenate(thresholds)
+        # children[2 * node] is the right child, children[2 * node + 1] the left one,
+        # so one gather indexed by the split outcome replaces a where() over both
+        self.children = np.empty(2 * offset, dtype=np.int64)
+        self.children[0::2] = np.concatenate(rights)
+        self.children[1::2] = np.concatenate(lefts)
+        self.is_leaf = self.children[1::2] == np.arange(offset)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = int(max_depth)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def transform(self, X: Any) -> np.ndarray:
+        Xt = self.preprocess.transform(X)
+        if sparse.issparse(Xt):
+            Xt = Xt.toarray()
+        # sklearn trees compare float32 inputs against float64 thresholds
+        return np.asarray(Xt, dtype=np.float32).astype(np.float64)
+
+    def leaves(self, Xt: np.ndarray) -> np.ndarray:
+        # (n_samples, n_trees) index of the leaf each sample lands in, per tree.
+        # Walks every (sample, tree) pair one level per step and drops pairs
+        # as soon as they reach a leaf, so shallow paths stop costing work.
+        n_samples, n_features = Xt.shape
+        flat_X = np.ascontiguousarray(Xt).ravel()
+        node = np.tile(self.roots, n_samples)
+        row_base = np.repeat(np.arange(n_samples, dtype=np.int64) * n_features, self.n_trees)
+        active = np.flatnonzero(~self.is_leaf[node])
+        current = node[active]
+        row_base = row_base[active]
+        while active.size:
+            go_left = flat_X[row_base + self.feature[current]] <= self.threshold[current]
+            current = self.children[2 * current + go_left]
+            node[active] = current
+            keep = ~self.is_leaf[current]
+            active, current, row_base = active[keep], current[keep], row_base[keep]
+        return node.reshape(n_samples, self.n_trees)
+
+    def per_tree(self, X: Any) -> np.ndarray:
+        # (n_samples, n_trees, n_outputs) leaf values of every tree
+        return self.value[self.leaves(self.transform(X))]
+
+    def _mean_over_trees(self, X: Any) -> np.ndarray:
+        Xt = self.transform(X)
+        out = np.empty((Xt.shape[0], self.value.shape[1]), dtype=np.float64)
+        # Row chunks keep the gathered (rows, trees, outputs) block cache-sized
+        for start in range(0, Xt.shape[0], self.CHUNK_ROWS):
+            stop = start + self.CHUNK_ROWS
+            out[start:stop] = self.value[self.leaves(Xt[start:stop])].mean(axis=1)
+        return out
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self._mean_over_trees(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        mean = self._mean_over_trees(X)
+        if self.is_classifier:
+            return self.classes_[np.argmax(mean, axis=1)]
+        return mean[:, 0]
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledForest:
+    return CompiledForest(pipeline)
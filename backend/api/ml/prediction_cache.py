@@ -0,0 +1,69 @@
+import hashlib
+import math
+import threading
+from typing import Any, Callable, Dict
+
+from .runtime import ml_setting
+
+
+class PredictionCache:
+    # Caches prediction responses in Django's cache framework (locmem per process
+    # by default, Redis when configured), keyed on the coerced feature tuple and
+    # the model artifact version, so retraining invalidates old entries by itself.
+
+    def __init__(self, namespace: str, alias_setting: str = "ML_PREDICTION_CACHE_ALIAS",
+                 ttl_setting: str = "ML_PREDICTION_CACHE_TTL"):
+        self.namespace = namespace
+        self.alias_setting = alias_setting
+        self.ttl_setting = ttl_setting
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _backend(self):
+        # None when caching is disabled or Django isn't configured (scripts)
+        if not ml_setting(self.ttl_setting, 0):
+            return None
+        from django.core.cache import caches
+        return caches[ml_setting(self.alias_setting, "default")]
+
+    def normalize(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        # Optional rounding buckets so near-identical soil readings share an entry;
+        # the rounded values are also what gets scored, keeping a bucket consistent
+        digits = ml_setting("ML_PREDICTION_CACHE_ROUNDING", None)
+        if digits is None:
+            return features
+        return {
+            k: round(v, digits) if isinstance(v, float) and not math.isnan(v) else v
+            for k, v in features.items()
+        }
+
+    def key(self, features: Dict[str, Any], version: str) -> str:
+        digest = hashlib.sha1(repr(tuple(features.items())).encode()).hexdigest()
+        return f"ml:{self.namespace}:{version}:{digest}"
+
+    def get_or_compute(self, features: Dict[str, Any], version: str, compute: Callable[[], Any]) -> Any:
+        backend = self._backend()
+        if backend is None:
+            return compute()
+
+        key = self.key(features, version)
+        cached = backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        result = compute()
+        backend.set(key, result, timeout=ml_setting(self.ttl_setting, 0))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
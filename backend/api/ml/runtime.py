@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Tuple
+
+import joblib
+from joblib import parallel_config
+
+logger = logging.getLogger(__name__)
+
+
+def ml_setting(name: str, default: Any) -> Any:
+    # Read a Django setting, falling back to the default when the ML modules
+    # are used outside a configured Django project (scripts, notebooks)
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, name, default)
+    except ImportError:
+        pass
+    return default
+
+
+def load_artifact(path: Any, mmap: bool | None = None) -> Any:
+    # With mmap, numpy arrays pickled as such (e.g. encoder categories, imputer
+    # statistics, the yield lookup table) stay file-backed and read-only, shared
+    # through the page cache by every worker on the host. sklearn tree nodes are
+    # not among them: Tree.__setstate__ copies them into private memory, so most
+    # of a forest's footprint is still per process.
+    # Only uncompressed dumps can be mapped; joblib silently loads compressed ones.
+    if mmap is None:
+        mmap = ml_setting("ML_ARTIFACT_MMAP", False)
+    return joblib.load(path, mmap_mode="r" if mmap else None)
+
+
+def artifact_version(path: Any) -> str:
+    # Changes whenever the artifact is rewritten; used to key caches per model build
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "unsaved"
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def dump_atomic(obj: Any, path: str, **kwargs: Any) -> None:
+    # Write next to the target and swap in place so readers never see a partial file.
+    # Left uncompressed by default so the artifact can be loaded with mmap.
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        joblib.dump(obj, tmp_path, **kwargs)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def apply_inference_policy(pipeline: Any) -> Any:
+    # Artifacts are pickled with n_jobs=-1. Clearing it lets inference_jobs()
+    # pick the concurrency per call instead of every worker fanning out to all cores.
+    estimator = pipeline.steps[-1][1]
+    if hasattr(estimator, "n_jobs"):
+        estimator.n_jobs = None
+    return pipeline
+
+
+def inference_jobs(batch: bool = False):
+    # joblib's parallel config is thread-local, so concurrent requests in one
+    # worker each get their own setting
+    if batch:
+        n_jobs = ml_setting("ML_BATCH_N_JOBS", -1)
+    else:
+        n_jobs = ml_setting("ML_ONLINE_N_JOBS", 1)
+    return parallel_config(n_jobs=n_jobs)
+
+
+class ArtifactRegistry:
+    # Process-level cache of one loaded artifact that follows the file on disk.
+    # get() stats the file at most every ML_RELOAD_CHECK_INTERVAL seconds and
+    # reloads when its version (mtime + size, which dump_atomic's rename always
+    # changes) moves. The new model is swapped in with a single reference
+    # assignment, so predictions already holding the old one finish on it.
+
+    def __init__(self, path: Any, loader: Callable[[Any], Any]):
+        self.path = path
+        self.loader = loader
+        self._current: Tuple[Any, str] | None = None  # (loaded value, version)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        interval = ml_setting("ML_RELOAD_CHECK_INTERVAL", 2.0)
+        if time.monotonic() - self._checked_at < interval:
+            return False
+        self._checked_at = time.monotonic()
+        version = artifact_version(self.path)
+        # A deleted artifact keeps serving the loaded model
+        return version != "unsaved" and version != self._current[1]
+
+    def get(self) -> Tuple[Any, str]:
+        current = self._current
+        if current is not None and not self._stale():
+            return current
+
+        with self._lock:
+            current = self._current
+            version = artifact_version(self.path)
+            if current is not None and version in (current[1], "unsaved"):
+                return current
+            if version == "unsaved":
+                raise FileNotFoundError(self.path)
+            try:
+                value = self.loader(self.path)
+            except Exception:
+                if current is None:
+                    raise
+                # Half-written or incompatible file: keep serving the old model
+                logger.exception("Reloading %s failed; keeping version %s", self.path, current[1])
+                return current
+            self._current = (value, version)
+            self._checked_at = time.monotonic()
+            if current is not None:
+                logger.info("Reloaded %s (%s -> %s)", self.path, current[1], version)
+            return self._current
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+from typing import Any, Callable, Dict
+
+# spawn, not fork: the serving process has live threads (thread pools, DB
+# connections) that must not be cloned into the trainer
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _train_in_child(force: bool, conn) -> None:
+    # Spawned children start bare: load the settings module (not the app
+    # registry, whose ready() hooks start threads) so ML_* / YIELD_* apply
+    if os.environ.get("DJANGO_SETTINGS_MODULE"):
+        from django.conf import settings
+        settings.DEBUG
+    from . import yield_model
+
+    try:
+        result = yield_model.train_and_save(
+            force=force, progress=lambda stage, fraction: conn.send(("progress", stage, fraction))
+        )
+        conn.send(("done", result))
+    except BaseException as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def train_yield_in_subprocess(force: bool, progress: Callable[..., None]) -> Dict[str, Any]:
+    # Fits the yield model in a separate process so the forest fit neither holds
+    # the serving worker's GIL nor grows its heap. The child publishes the
+    # artifact with dump_atomic, and serving processes pick it up through the
+    # yield model registry. progress(stage=..., progress=...) relays updates.
+    parent_conn, child_conn = _CONTEXT.Pipe(duplex=False)
+    # Not a daemon: joblib drops daemonic processes to n_jobs=1, serializing the fit
+    process = _CONTEXT.Process(target=_train_in_child, args=(force, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        while True:
+            try:
+                message = parent_conn.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"Training process exited unexpectedly (code {process.exitcode})")
+            if message[0] == "progress":
+                progress(stage=message[1], progress=round(message[2], 3))
+            elif message[0] == "done":
+                return message[1]
+            else:
+                raise RuntimeError(message[1])
+    finally:
+        parent_conn.close()
+        process.join(timeout=5)
@@ -0,0 +1,42 @@
+import logging
+from typing import Dict
+
+from . import crop_model, disease_model, fertilizer_model, yield_model
+
+logger = logging.getLogger(__name__)
+
+
+def preload_models() -> Dict[str, str]:
+    # Load every model into this process. Called from kisan_saarthi/wsgi.py, so
+    # under `gunicorn --preload` the arrays are built once in the master and
+    # shared copy-on-write by the forked workers. Never trains: missing
+    # artifacts are built by `manage.py warm_models`.
+    status: Dict[str, str] = {}
+    for name, module in (("crop", crop_model), ("fertilizer", fertilizer_model)):
+        try:
+            module.get_model(train_if_missing=False)
+            status[name] = "loaded"
+        except Exception as exc:
+            logger.warning("Could not preload %s model: %s", name, exc)
+            status[name] = f"failed: {exc}"
+
+    # The yield artifact is optional (needs crop_production.csv); only check it loads
+    if yield_model.MODEL_PATH.exists():
+        try:
+            yield_model.get_model()
+            status["yield"] = "loaded"
+        except Exception as exc:
+            logger.warning("Could not preload yield model: %s", exc)
+            status["yield"] = f"failed: {exc}"
+    else:
+        status["yield"] = "missing"
+
+    # Local disease classifier session, only when it is the active backend
+    if disease_model.active_backend() == "local":
+        try:
+            disease_model.get_session()
+            status["disease"] = "loaded"
+        except Exception as exc:
+            logger.warning("Could not preload disease model: %s", exc)
+            status["disease"] = f"failed: {exc}"
+    return status
@@ -1,15 +1,22 @@
+import importlib.util
+import math
 import os
 from pathlib import Path
-import joblib
+from typing import Any, Dict, List
 import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+from .runtime import (
+    ArtifactRegistry, apply_inference_policy, artifact_version, dump_atomic, inference_jobs, load_artifact, ml_setting,
+)
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DATA_PATH = BASE_DIR / 'data' / 'crop_production.csv'
+DATASET_CACHE_DIR = BASE_DIR / 'data' / 'cache'
 MODEL_DIR = Path(__file__).resolve().parent
 MODEL_PATH = MODEL_DIR / 'yield_model.joblib'
 
@@ -17,61 +24,178 @@ CATEGORICAL_FEATURES = ['crop', 'season']
 NUMERIC_FEATURES = ['year']
 TARGET_COLUMN = 'yield_per_ha'
 
-
-def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [c.strip().lower().replace(' ', '_') for c in df.columns]
+# Downsample very large datasets to keep forest training responsive; the "hgb"
+# backend trains on every row
+MAX_TRAINING_ROWS = 80000
+
+MODEL_BACKENDS = ('forest', 'hgb')
+
+# Per-cell arrays of the lookup table: point prediction, interval bounds and
+# the per-tree standard deviation
+TABLE_STATS = ('values', 'low', 'high', 'std')
+# Rows per (rows, trees) block when scoring a forest tree by tree
+SCORE_CHUNK_ROWS = 4096
+
+# The only CSV columns training reads, parsed straight into narrow dtypes
+# (state/district are never loaded). Year is parsed as float32, which holds
+# missing values and is much faster to parse than the nullable Int16, and is
+# narrowed to int16 once incomplete rows are dropped.
+INGEST_DTYPES = {
+    'crop': 'category',
+    'season': 'category',
+    'year': 'float32',
+    'area': 'float32',
+    'production': 'float32',
+}
+
+# pyarrow is optional: with it the cleaned dataset is cached as Parquet so
+# retraining skips CSV parsing; without it every run reads the CSV
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+def _standard_name(column: str) -> str:
+    name = column.strip().lower().replace(' ', '_')
     # Common variants
     rename_map = {
         'state_name': 'state',
         'district_name': 'district',
         'crop_year': 'year',
     }
-    df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns}, inplace=True)
-    return df
-
+    return rename_map.get(name, name)
 
-def _clean_and_engineer(df: pd.DataFrame) -> pd.DataFrame:
-    df = _standardize_columns(df)
 
-    # Ensure required columns exist (allow common variants)
-    required_cols = []
-    # Production & Area columns can have different cases / underscores
-    prod_col = 'production' if 'production' in df.columns else None
-    area_col = 'area' if 'area' in df.columns else None
-    crop_col = 'crop' if 'crop' in df.columns else None
-    season_col = 'season' if 'season' in df.columns else ('whole_year' if 'whole_year' in df.columns else None)
-    year_col = 'year' if 'year' in df.columns else None
-
-    for name, col in [('production', prod_col), ('area', area_col), ('crop', crop_col), ('season', season_col), ('year', year_col)]:
-        if col is None:
+def _source_columns(path) -> dict:
+    # Training column -> CSV header, resolved from the header row alone
+    header = {_standard_name(c): c for c in pd.read_csv(path, nrows=0).columns}
+    if 'season' not in header and 'whole_year' in header:
+        header['season'] = header['whole_year']
+    for name in INGEST_DTYPES:
+        if name not in header:
             raise ValueError(f"Missing required column: {name}")
-        required_cols.append(col)
-
-    df = df[required_cols].copy()
-
-    # Basic cleaning
-    df = df.dropna()
-    # Keep valid positives
-    df = df[(df[area_col] > 0) & (df[prod_col] >= 0)]
-
-    # Compute yield per hectare; production is often in tonnes; convert to kg if needed
-    # If units unknown, model learns relative mapping; we keep as production/area
-    df[TARGET_COLUMN] = df[prod_col] / df[area_col]
-
-    # Remove extreme outliers (1st-99th percentiles)
+    return {name: header[name] for name in INGEST_DTYPES}
+
+
+def _normalize_categories(values: pd.Series, normalize) -> pd.Categorical:
+    # Normalizes the few distinct labels rather than every row; variants that
+    # collapse to the same label (" Rice", "rice") share one code
+    labels = normalize(values.cat.categories.astype(str).str.strip())
+    uniques, codes = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    return pd.Categorical.from_codes(codes[values.cat.codes.to_numpy()], uniques)
+
+
+def _read_clean_chunks(path, chunk_rows: int):
+    # Yields cleaned (crop, season, year, yield) frames chunk by chunk, so the
+    # raw file is never held in memory at once
+    columns = _source_columns(path)
+    reader = pd.read_csv(
+        path,
+        usecols=list(columns.values()),
+        dtype={source: INGEST_DTYPES[name] for name, source in columns.items()},
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns={source: name for name, source in columns.items()}).dropna()
+        # Keep valid positives
+        chunk = chunk[(chunk['area'] > 0) & (chunk['production'] >= 0)]
+        # Yield per hectare as production/area (units as published); the model
+        # learns the relative mapping
+        yield pd.DataFrame({
+            'crop': _normalize_categories(chunk['crop'], lambda s: s.str.lower()),
+            'season': _normalize_categories(chunk['season'], lambda s: s.str.title()),
+            'year': chunk['year'].to_numpy('int16'),
+            TARGET_COLUMN: chunk['production'].to_numpy('float64') / chunk['area'].to_numpy('float64'),
+        })
+
+
+def _dataset_cache_path(path) -> Path:
+    # Keyed on the CSV's mtime/size, so replacing the file invalidates the cache
+    return DATASET_CACHE_DIR / f"{Path(path).stem}-{artifact_version(path)}.parquet"
+
+
+def _iter_dataset(path, chunk_rows: int):
+    # Cleaned chunks from the Parquet cache when it matches the CSV; otherwise
+    # from the CSV, writing the cache as the chunks stream past
+    if not PARQUET_AVAILABLE:
+        yield from _read_clean_chunks(path, chunk_rows)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_path = _dataset_cache_path(path)
+    if cache_path.exists():
+        cached = pq.ParquetFile(cache_path, read_dictionary=CATEGORICAL_FEATURES)
+        for batch in cached.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+
+    schema = pa.schema([
+        ('crop', pa.string()), ('season', pa.string()), ('year', pa.int16()), (TARGET_COLUMN, pa.float64()),
+    ])
+    DATASET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp-{os.getpid()}")
+    try:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for frame in _read_clean_chunks(path, chunk_rows):
+                writer.write_table(pa.Table.from_pandas(frame, preserve_index=False).cast(schema))
+                yield frame
+        os.replace(tmp_path, cache_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    for stale in DATASET_CACHE_DIR.glob(f"{Path(path).stem}-*.parquet"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+def _reservoir_sample(chunks, size: int | None, seed: int = 42) -> pd.DataFrame:
+    # Uniform sample of at most `size` rows from a stream: every row draws a
+    # random key and the rows with the `size` smallest keys so far are kept.
+    # size=None keeps every row.
+    if size is None:
+        frames = list(chunks)
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        return pd.DataFrame(columns=[*CATEGORICAL_FEATURES, *NUMERIC_FEATURES, TARGET_COLUMN])
+
+    rng = np.random.default_rng(seed)
+    sample, keys = None, None
+    for chunk in chunks:
+        chunk_keys = rng.random(len(chunk))
+        if sample is not None:
+            chunk = pd.concat([sample, chunk], ignore_index=True)
+            chunk_keys = np.concatenate([keys, chunk_keys])
+        if len(chunk) > size:
+            keep = np.sort(np.argpartition(chunk_keys, size)[:size])
+            chunk, chunk_keys = chunk.iloc[keep].reset_index(drop=True), chunk_keys[keep]
+        sample, keys = chunk, chunk_keys
+    if sample is None:
+        return pd.DataFrame(columns=[*CATEGORICAL_FEATURES, *NUMERIC_FEATURES, TARGET_COLUMN])
+    return sample
+
+
+def load_training_data(path=None, max_rows: int | None = MAX_TRAINING_ROWS, chunk_rows: int | None = None) -> pd.DataFrame:
+    # Cleaned training rows: streamed and reservoir-sampled down to max_rows
+    # (None for the whole dataset)
+    chunk_rows = chunk_rows or ml_setting('YIELD_INGEST_CHUNK_ROWS', 100000)
+    df = _reservoir_sample(_iter_dataset(path or DATA_PATH, chunk_rows), max_rows)
+    for column in CATEGORICAL_FEATURES:
+        df[column] = df[column].astype(str)
+
+    # Remove extreme outliers (1st-99th percentiles), estimated on the sample
     low, high = df[TARGET_COLUMN].quantile([0.01, 0.99])
     df = df[(df[TARGET_COLUMN] >= low) & (df[TARGET_COLUMN] <= high)]
+    return df.reset_index(drop=True)
 
-    # Normalize categorical values
-    df['crop'] = df[crop_col].astype(str).str.strip().str.lower()
-    df['season'] = df[season_col].astype(str).str.strip().str.title()
-    df['year'] = df[year_col].astype(int)
 
-    return df[[*CATEGORICAL_FEATURES, *NUMERIC_FEATURES, TARGET_COLUMN]].reset_index(drop=True)
+def _model_backend(backend: str | None = None) -> str:
+    backend = backend or ml_setting('YIELD_MODEL_BACKEND', 'forest')
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown yield model backend: {backend}")
+    return backend
 
 
-def _build_pipeline() -> Pipeline:
+def _build_forest_pipeline() -> Pipeline:
     preprocessor = ColumnTransformer(
         transformers=[
             ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES),
@@ -95,69 +219,373 @@ def _build_pipeline() -> Pipeline:
     return pipeline
 
 
-def train_and_save(force: bool = False) -> dict:
+def _build_hgb_pipeline() -> Pipeline:
+    # Crop and season become ordinal codes that the booster splits on natively
+    # (category subsets, no one-hot columns). Unseen labels map to -1, which
+    # HistGradientBoosting treats as missing.
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('cat', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1), CATEGORICAL_FEATURES),
+            ('num', 'passthrough', NUMERIC_FEATURES),
+        ]
+    )
+
+    model = HistGradientBoostingRegressor(
+        categorical_features=list(range(len(CATEGORICAL_FEATURES))),
+        max_iter=200,
+        learning_rate=0.1,
+        max_leaf_nodes=31,
+        min_samples_leaf=20,
+        early_stopping=False,
+        random_state=42,
+    )
+
+    pipeline = Pipeline(steps=[
+        ('preprocess', preprocessor),
+        ('regressor', model)
+    ])
+    return pipeline
+
+
+def _build_pipeline(backend: str | None = None) -> Pipeline:
+    # YIELD_MODEL_BACKEND picks the estimator: "forest" (RandomForest on a sample
+    # of MAX_TRAINING_ROWS) or "hgb" (histogram gradient boosting on every row)
+    if _model_backend(backend) == 'hgb':
+        return _build_hgb_pipeline()
+    return _build_forest_pipeline()
+
+
+def train_and_save(force: bool = False, progress=None) -> dict:
+    # progress(stage, fraction) is called as training advances (background jobs)
+    report = progress or (lambda stage, fraction: None)
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Dataset not found at {DATA_PATH}")
 
     if MODEL_PATH.exists() and not force:
         return {"status": "exists", "model_path": str(MODEL_PATH)}
 
-    df = pd.read_csv(DATA_PATH)
-    df_clean = _clean_and_engineer(df)
-
-    # Downsample very large datasets to keep initial training responsive
-    max_rows = 80000
-    if len(df_clean) > max_rows:
-        df_clean = df_clean.sample(n=max_rows, random_state=42).reset_index(drop=True)
+    backend = _model_backend()
+    report('reading', 0.0)
+    df_clean = load_training_data(max_rows=MAX_TRAINING_ROWS if backend == 'forest' else None)
+    if df_clean.empty:
+        raise ValueError(f"No usable rows in {DATA_PATH}")
 
     X = df_clean[[*CATEGORICAL_FEATURES, *NUMERIC_FEATURES]]
     y = df_clean[TARGET_COLUMN]
 
-    pipeline = _build_pipeline()
-    pipeline.fit(X, y)
-
-    # Persist pipeline and basic metadata
+    pipeline = _build_pipeline(backend)
+    preprocess = pipeline.named_steps['preprocess']
+    regressor = pipeline.named_steps['regressor']
+    Xt = preprocess.fit_transform(X)
+
+    if backend == 'forest':
+        # Grow the forest in steps to report progress; warm_start draws the same
+        # per-tree seeds as a single fit, so the model is identical
+        n_estimators = regressor.n_estimators
+        step = max(n_estimators // 6, 1)
+        regressor.set_params(warm_start=True)
+        for n in range(step, n_estimators + step, step):
+            report('fitting', 0.1 + 0.8 * (min(n, n_estimators) - step) / n_estimators)
+            regressor.set_params(n_estimators=min(n, n_estimators))
+            regressor.fit(Xt, y)
+        regressor.set_params(warm_start=False)
+    else:
+        # One fit: each warm_start step would re-bin the data and replay every
+        # earlier iteration (about 4x the time), and the full fit takes seconds
+        report('fitting', 0.1)
+        regressor.fit(Xt, y)
+
+    # Persist pipeline, basic metadata and the precomputed lookup table
     metadata = {
+        'backend': backend,
         'features': [*CATEGORICAL_FEATURES, *NUMERIC_FEATURES],
         'target': TARGET_COLUMN,
         'rows': int(len(df_clean)),
+        'year_range': (int(df_clean['year'].min()), int(df_clean['year'].max())),
     }
+    report('precomputing', 0.9)
+    table = build_table(pipeline, metadata)
 
-    joblib.dump({
+    report('saving', 0.95)
+    dump_atomic({
         'pipeline': pipeline,
         'metadata': metadata,
-    }, MODEL_PATH)
+        'table': table,
+    }, str(MODEL_PATH))
 
     return {"status": "trained", "rows": metadata['rows'], "model_path": str(MODEL_PATH)}
 
 
-def _load_artifacts():
-    if not MODEL_PATH.exists():
+def _table_years(metadata: dict):
+    # Training years plus YIELD_TABLE_YEARS_AHEAD, unless pinned by settings
+    first, last = metadata.get('year_range', (None, None))
+    first = ml_setting('YIELD_TABLE_FIRST_YEAR', None) or first
+    last = ml_setting('YIELD_TABLE_LAST_YEAR', None) or (last + ml_setting('YIELD_TABLE_YEARS_AHEAD', 10) if last else None)
+    if first is None or last is None or last < first:
+        return None
+    return int(first), int(last)
+
+
+def _interval_quantiles(coverage: float):
+    tail = (1 - coverage) / 2
+    return tail, 1 - tail
+
+
+def _is_forest(pipeline: Pipeline) -> bool:
+    return isinstance(pipeline.named_steps['regressor'], RandomForestRegressor)
+
+
+def _leaf_values(regressor: RandomForestRegressor):
+    # Every tree's node values in one flat array, plus each tree's offset into it
+    values = [tree.tree_.value[:, 0, 0] for tree in regressor.estimators_]
+    offsets = np.cumsum([0] + [len(v) for v in values[:-1]])
+    return np.concatenate(values), offsets
+
+
+def _score_rows(pipeline: Pipeline, X: pd.DataFrame, coverage: float, leaf_values=None) -> np.ndarray:
+    # (rows, 4) columns of TABLE_STATS. A forest is evaluated once: apply() finds
+    # every row's leaf in every tree and a single gather turns those into a
+    # (rows, trees) block of per-tree predictions (no predict() per estimator);
+    # the mean, interval and std all come from that block.
+    # Other backends have no per-tree spread, so their low/high/std stay NaN.
+    out = np.full((len(X), len(TABLE_STATS)), np.nan)
+    batch = len(X) > 1
+    if not _is_forest(pipeline):
+        with inference_jobs(batch=batch):
+            out[:, 0] = pipeline.predict(X)
+        return out
+
+    regressor = pipeline.named_steps['regressor']
+    values, offsets = leaf_values or _leaf_values(regressor)
+    quantiles = _interval_quantiles(coverage)
+    for start in range(0, len(X), SCORE_CHUNK_ROWS):
+        stop = start + SCORE_CHUNK_ROWS
+        Xt = pipeline.named_steps['preprocess'].transform(X.iloc[start:stop])
+        with inference_jobs(batch=batch):
+            leaves = regressor.apply(Xt)
+        per_tree = values[leaves + offsets]
+        out[start:stop, 0] = per_tree.mean(axis=1)
+        out[start:stop, 1:3] = np.quantile(per_tree, quantiles, axis=1).T
+        out[start:stop, 3] = per_tree.std(axis=1)
+    return out
+
+
+def build_table(pipeline: Pipeline, metadata: dict):
+    # The model only sees (crop, season, year), so score every known crop x season
+    # pair over the year range in one batched pass and keep the dense result
+    years = _table_years(metadata)
+    if years is None:
+        return None
+    crops, seasons = pipeline.named_steps['preprocess'].named_transformers_['cat'].categories_
+    year_values = np.arange(years[0], years[1] + 1)
+
+    grid = pd.DataFrame({
+        'crop': np.repeat(crops, len(seasons) * len(year_values)),
+        'season': np.tile(np.repeat(seasons, len(year_values)), len(crops)),
+        'year': np.tile(year_values, len(crops) * len(seasons)),
+    })
+    coverage = ml_setting('YIELD_INTERVAL_COVERAGE', 0.8)
+    cells = _score_rows(pipeline, grid, coverage)
+    shape = (len(crops), len(seasons), len(year_values))
+    return {
+        'crops': [str(c) for c in crops],
+        'seasons': [str(v) for v in seasons],
+        'first_year': years[0],
+        'coverage': coverage,
+        **{name: cells[:, n].reshape(shape) for n, name in enumerate(TABLE_STATS)},
+    }
+
+
+def _load_bundle(path):
+    bundle = load_artifact(path)
+    pipeline = apply_inference_policy(bundle['pipeline'])
+    table = bundle.get('table')
+    if table is None or table.get('coverage') != ml_setting('YIELD_INTERVAL_COVERAGE', 0.8):
+        # Artifacts from before the lookup table or its intervals, or built for
+        # another interval coverage: build it once at load
+        table = build_table(pipeline, bundle['metadata'])
+    if table is not None:
+        table = {
+            **table,
+            'crop_index': {c: i for i, c in enumerate(table['crops'])},
+            'season_index': {v: i for i, v in enumerate(table['seasons'])},
+            'cells': np.stack([table[name] for name in TABLE_STATS], axis=-1),
+        }
+    return {'pipeline': pipeline, 'metadata': bundle['metadata'], 'table': table}
+
+
+# Loaded once per process and hot-swapped when the artifact file is replaced
+_REGISTRY = ArtifactRegistry(MODEL_PATH, _load_bundle)
+
+
+def _get_bundle() -> dict:
+    try:
+        bundle, _ = _REGISTRY.get()
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Yield model not found at {MODEL_PATH}. Train it first via POST /api/yield/train/."
         )
-    bundle = joblib.load(MODEL_PATH)
+    return bundle
+
+
+def get_model():
+    # (pipeline, metadata) of the current artifact
+    bundle = _get_bundle()
     return bundle['pipeline'], bundle['metadata']
 
 
+def model_version() -> str:
+    return _REGISTRY.get()[1]
+
+
+def training_lock_path() -> Path:
+    # Held by the training job for the whole fit (api/jobs.py), so only one
+    # process on the host writes this artifact at a time
+    return MODEL_PATH.with_name(MODEL_PATH.name + '.lock')
+
+
+def _bundle_leaf_values(bundle: dict):
+    # Flattened per-tree values for rows the table doesn't cover, built on first
+    # use and dropped with the bundle when the artifact is swapped
+    leaf_values = bundle.get('leaf_values')
+    if leaf_values is None:
+        leaf_values = bundle['leaf_values'] = _leaf_values(bundle['pipeline'].named_steps['regressor'])
+    return leaf_values
+
+
+def _score(bundle: dict, crops, seasons, years) -> np.ndarray:
+    # (rows, 4) TABLE_STATS for normalized keys: one gather from the table for
+    # every tabulated row, one model pass over the rest (unseen crop/season or
+    # a year outside the table)
+    n = len(crops)
+    out = np.empty((n, len(TABLE_STATS)))
+    missing = np.ones(n, dtype=bool)
+    table = bundle['table']
+    if table is not None:
+        i = np.fromiter((table['crop_index'].get(c, -1) for c in crops), dtype=np.intp, count=n)
+        j = np.fromiter((table['season_index'].get(v, -1) for v in seasons), dtype=np.intp, count=n)
+        k = np.asarray(years) - table['first_year']
+        hit = (i >= 0) & (j >= 0) & (k >= 0) & (k < table['cells'].shape[2])
+        out[hit] = table['cells'][i[hit], j[hit], k[hit]]
+        missing = ~hit
+    if missing.any():
+        pipeline = bundle['pipeline']
+        X = pd.DataFrame({
+            'crop': np.asarray(crops, dtype=object)[missing],
+            'season': np.asarray(seasons, dtype=object)[missing],
+            'year': np.asarray(years)[missing],
+        })
+        coverage = table['coverage'] if table is not None else ml_setting('YIELD_INTERVAL_COVERAGE', 0.8)
+        out[missing] = _score_rows(pipeline, X, coverage, _bundle_leaf_values(bundle) if _is_forest(pipeline) else None)
+    return out
+
+
+def _rounded(values: np.ndarray, digits: int = 2) -> list:
+    # Rounded floats for JSON, NaN (no per-tree spread) as None
+    return [None if math.isnan(v) else v for v in np.round(values, digits).tolist()]
+
+
+def _yield_results(stats: np.ndarray, areas: np.ndarray) -> List[Dict[str, Any]]:
+    # Per-plot results for (plots, 4) TABLE_STATS rows; area scaling and rounding
+    # run column-wise over the whole batch
+    yield_per_ha, low, high, std = stats.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 100 when every tree agrees, falling as their std approaches the prediction
+        confidence = np.where(yield_per_ha > 0, 100 * np.maximum(0.0, 1 - std / yield_per_ha), np.nan)
+    columns = {
+        'yieldPerHa': _rounded(yield_per_ha),
+        'totalYield': _rounded(yield_per_ha * areas),
+        'quintalsPerHa': _rounded(yield_per_ha / 0.1),  # 1 quintal = 100 kg
+        # Per-hectare band holding the central YIELD_INTERVAL_COVERAGE of the
+        # per-tree predictions (None for backends without trees to compare)
+        'yieldLow': _rounded(low),
+        'yieldHigh': _rounded(high),
+        'confidence': _rounded(confidence, 1),
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def _normalize_key(crop, season, year):
+    return str(crop).strip().lower(), str(season).strip().title(), int(year)
+
+
 def predict_yield(crop: str, season: str, year: int, area: float) -> dict:
-    pipeline, _ = _load_artifacts()
+    # Local reference: a concurrent hot swap doesn't affect this prediction
+    bundle = _get_bundle()
 
-    crop = str(crop).strip().lower()
-    season = str(season).strip().title()
-    year = int(year)
+    crop, season, year = _normalize_key(crop, season, year)
     area = float(area)
-    if area <= 0:
+    # NaN and inf would poison the totals and can't be rendered as JSON
+    if not math.isfinite(area) or area <= 0:
         raise ValueError('Area must be > 0')
 
-    X = pd.DataFrame([{ 'crop': crop, 'season': season, 'year': year }])
-    yield_per_ha = float(pipeline.predict(X)[0])
-
-    total_yield = float(yield_per_ha * area)
-    quintals_per_ha = yield_per_ha / 0.1 if yield_per_ha is not None else None  # 1 quintal = 100 kg
+    return _yield_results(_score(bundle, [crop], [season], [year]), np.array([area]))[0]
+
+
+def _parse_plots(items: List[Dict[str, Any]]):
+    # Distinct normalized (crop, season, year) keys in first-seen order, each
+    # plot's index into them, and the plot areas
+    keys, codes, areas = {}, [], []
+    for n, item in enumerate(items):
+        try:
+            crop = item.get('cropName') or item.get('crop')
+            if crop is None or item.get('season') is None or item.get('year') is None or item.get('area') is None:
+                raise ValueError('Missing required fields: cropName, season, year, area')
+            key = _normalize_key(crop, item['season'], item['year'])
+            area = float(item['area'])
+            if not math.isfinite(area) or area <= 0:
+                raise ValueError('Area must be > 0')
+        except (AttributeError, TypeError, ValueError) as exc:
+            raise ValueError(f"Item {n}: {exc}")
+        codes.append(keys.setdefault(key, len(keys)))
+        areas.append(area)
+    return list(keys), np.asarray(codes, dtype=np.intp), np.asarray(areas, dtype=np.float64)
+
+
+def _summaries(sums: np.ndarray) -> List[Dict[str, Any]]:
+    # Rows of (plots, area, total yield, summed low bound, summed high bound).
+    # The bounds are plain sums of the per-plot bounds, not an interval fitted
+    # to the total, and stay None for backends without a spread.
+    plots, area, total, total_low, total_high = sums.T
+    columns = {
+        'plots': plots.astype(int).tolist(),
+        'area': _rounded(area),
+        'yieldPerHa': _rounded(total / area),
+        'totalYield': _rounded(total),
+        'totalYieldLow': _rounded(total_low),
+        'totalYieldHigh': _rounded(total_high),
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def predict_yield_batch(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Batch predict_yield for {cropName|crop, season, year, area} plots, e.g. a
+    # whole village. Each distinct (crop, season, year) is scored once (table
+    # gather, plus one model pass for keys the table doesn't cover) and
+    # broadcast to its plots; totals are summed per crop and season.
+    bundle = _get_bundle()
+    keys, codes, areas = _parse_plots(items)
+    if not keys:
+        return {'results': [], 'groups': [], 'totals': None}
+
+    crops, seasons, years = zip(*keys)
+    stats = _score(bundle, crops, seasons, years)[codes]
+    yield_per_ha, low, high = stats[:, 0], stats[:, 1], stats[:, 2]
+
+    group_index = {}
+    key_groups = np.fromiter(
+        (group_index.setdefault((crop, season), len(group_index)) for crop, season, _ in keys),
+        dtype=np.intp, count=len(keys),
+    )
+    plot_groups = key_groups[codes]
+    sums = np.stack([
+        np.bincount(plot_groups, weights=weights, minlength=len(group_index))
+        for weights in (np.ones_like(areas), areas, yield_per_ha * areas, low * areas, high * areas)
+    ], axis=1)
 
+    groups = _summaries(sums)
     return {
-        'yieldPerHa': round(yield_per_ha, 2),
-        'totalYield': round(total_yield, 2),
-        'quintalsPerHa': round(quintals_per_ha, 2) if quintals_per_ha is not None else None,
+        'results': _yield_results(stats, areas),
+        'groups': [{'crop': crop, 'season': season, **summary} for (crop, season), summary in zip(group_index, groups)],
+        'totals': _summaries(sums.sum(axis=0, keepdims=True))[0],
     }
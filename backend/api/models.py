@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 class UserProfile(models.Model):
@@ -19,3 +20,48 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
+
+
+class Scheme(models.Model):
+    # Government scheme catalog, refreshed from india.gov.in by api/schemes.py
+    title = models.CharField(max_length=300)
+    description = models.TextField(blank=True)
+    official_link = models.URLField(max_length=500, unique=True)
+    department = models.CharField(max_length=200, default="Government of India")
+    category = models.CharField(max_length=100, default="Agriculture", db_index=True)
+    state = models.CharField(max_length=100, default="All India", db_index=True)
+    eligibility = models.TextField(default="Check official link for details")
+    benefits = models.JSONField(default=list)
+    how_to_apply = models.TextField(default="Visit official website")
+    helpline = models.CharField(max_length=50, default="N/A")
+    email = models.CharField(max_length=100, default="N/A")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Hash of the listing row's HTML; unchanged rows are skipped on refresh
+    content_hash = models.CharField(max_length=40, blank=True)
+    # Weighted title + description tsvector for Postgres full-text search; filled by
+    # api/scheme_search.py and GIN-indexed in migration 0007 (unused on SQLite)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return self.title
+
+
+class ScrapedPage(models.Model):
+    # HTTP validators and body hash of each scheme listing page, so refreshes can
+    # send conditional GETs and skip pages that did not change
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=200, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=40, blank=True)
+    # Scheme and pager links the page listed when last parsed; a 304 page still
+    # vouches for its schemes, so complete refreshes can prune the rest
+    scheme_links = models.JSONField(default=list)
+    pager_links = models.JSONField(default=list)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
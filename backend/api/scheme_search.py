@@ -0,0 +1,189 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.db import connection
+from django.db.models import F
+
+from .models import Scheme
+from .schemes import catalog_state
+
+# Postgres text search configuration; "english" stems English words and passes
+# Devanagari and other scripts through as lowercase tokens
+SEARCH_CONFIG = "english"
+
+# Words in Latin letters plus the Indic script blocks (Devanagari .. Sinhala, minus
+# the danda full stops), whose vowel signs are combining marks that \w+ splits on
+TOKEN_RE = re.compile(r"[0-9a-z\u0900-\u0963\u0966-\u0DFF]+")
+
+# Hindi / regional farming terms (Devanagari and common romanizations) expanded to
+# the English and transliterated words that appear in india.gov.in scheme titles
+KEYWORD_SYNONYMS = {
+    "किसान": ["kisan", "farmer"],
+    "kisan": ["farmer"],
+    "फसल": ["fasal", "crop"],
+    "fasal": ["crop"],
+    "बीमा": ["bima", "insurance"],
+    "bima": ["insurance"],
+    "योजना": ["yojana", "scheme"],
+    "yojana": ["scheme"],
+    "ऋण": ["loan", "credit"],
+    "कर्ज": ["loan", "credit"],
+    "karz": ["loan", "credit"],
+    "rin": ["loan", "credit"],
+    "सिंचाई": ["sinchai", "irrigation"],
+    "sinchai": ["irrigation"],
+    "बीज": ["beej", "seed"],
+    "beej": ["seed"],
+    "खाद": ["khad", "fertilizer"],
+    "उर्वरक": ["fertilizer"],
+    "khad": ["fertilizer"],
+    "मिट्टी": ["mitti", "soil"],
+    "mitti": ["soil"],
+    "पशु": ["pashu", "livestock", "animal"],
+    "pashu": ["livestock", "animal"],
+    "पशुपालन": ["livestock", "animal", "husbandry"],
+    "मछली": ["fish", "fisheries"],
+    "मत्स्य": ["matsya", "fish", "fisheries"],
+    "matsya": ["fish", "fisheries"],
+    "dairy": ["milk"],
+    "दूध": ["milk", "dairy"],
+    "पेंशन": ["pension"],
+    "सब्सिडी": ["subsidy"],
+    "अनुदान": ["subsidy", "grant"],
+    "sahayata": ["assistance", "support"],
+    "सहायता": ["assistance", "support"],
+    "मंडी": ["mandi", "market"],
+    "mandi": ["market"],
+    "बाजार": ["market"],
+    "जैविक": ["organic"],
+    "बागवानी": ["horticulture"],
+    "बिजली": ["power", "solar"],
+    "सौर": ["solar"],
+    "kusum": ["solar", "pump"],
+    "पानी": ["water"],
+    "jal": ["water"],
+    "जल": ["jal", "water"],
+}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _stem(token):
+    # Light English suffix stripping so "insured"/"insurance" and "crops"/"crop" meet
+    if not token.isascii() or len(token) <= 4:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    for suffix in ("ance", "ing", "ed", "s"):
+        if token.endswith(suffix) and not token.endswith("ss"):
+            return token[: -len(suffix)]
+    return token
+
+
+def expand_query(query):
+    # One list of alternatives per query word: the word and its synonyms
+    return [[token] + KEYWORD_SYNONYMS.get(token, []) for token in tokenize(query)]
+
+
+class InvertedIndex:
+    # In-process BM25 index over title (weighted x3) and description, used when
+    # the database has no full-text search (SQLite dev/test runs)
+
+    K1 = 1.2
+    B = 0.75
+    TITLE_WEIGHT = 3
+
+    def __init__(self, rows):
+        self.postings = defaultdict(dict)  # term -> {scheme id: weighted tf}
+        self.lengths = {}
+        for scheme_id, title, description in rows:
+            terms = Counter()
+            for token in tokenize(title):
+                terms[_stem(token)] += self.TITLE_WEIGHT
+            for token in tokenize(description):
+                terms[_stem(token)] += 1
+            self.lengths[scheme_id] = sum(terms.values())
+            for term, tf in terms.items():
+                self.postings[term][scheme_id] = tf
+        self.avg_length = (sum(self.lengths.values()) / len(self.lengths)) if self.lengths else 0.0
+
+    def search(self, groups):
+        # Scores every scheme matching any alternative of any query word; a word's
+        # alternatives count once (best one) so synonyms don't inflate scores
+        n = len(self.lengths)
+        scores = defaultdict(float)
+        for alternatives in groups:
+            best = defaultdict(float)
+            for term in {_stem(t) for t in alternatives}:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for scheme_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self.lengths[scheme_id] / self.avg_length)
+                    best[scheme_id] = max(best[scheme_id], idf * tf * (self.K1 + 1) / (tf + norm))
+            for scheme_id, score in best.items():
+                scores[scheme_id] += score
+        return scores
+
+
+_INDEX = None
+_INDEX_STATE = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _get_index():
+    # Rebuilt whenever the catalog changes (latest update, row count)
+    global _INDEX, _INDEX_STATE
+    state = catalog_state()
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX_STATE != state:
+            _INDEX = InvertedIndex(Scheme.objects.values_list("id", "title", "description"))
+            _INDEX_STATE = state
+        return _INDEX
+
+
+def update_search_vectors():
+    # Keeps the tsvector column (GIN-indexed, migration 0007) in sync after refreshes
+    if connection.vendor != "postgresql":
+        return
+    from django.contrib.postgres.search import SearchVector
+
+    Scheme.objects.update(
+        search_vector=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+    )
+
+
+def search_schemes(query, queryset=None, offset=0, limit=20):
+    # Returns (total matches, [(scheme, score), ...]) for one page, best first
+    queryset = Scheme.objects.all() if queryset is None else queryset
+    groups = expand_query(query)
+    if not groups:
+        return 0, []
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search = None
+        for term in dict.fromkeys(t for alternatives in groups for t in alternatives):
+            term_query = SearchQuery(term, config=SEARCH_CONFIG)
+            search = term_query if search is None else search | term_query
+        matches = (
+            queryset.filter(search_vector=search)
+            .annotate(score=SearchRank(F("search_vector"), search))
+            .order_by("-score", "id")
+        )
+        total = matches.count()
+        return total, [(scheme, scheme.score) for scheme in matches[offset:offset + limit]]
+
+    scores = _get_index().search(groups)
+    ids = set(queryset.filter(id__in=list(scores)).values_list("id", flat=True))
+    ranked = sorted(ids, key=lambda scheme_id: (-scores[scheme_id], scheme_id))
+    page = ranked[offset:offset + limit]
+    by_id = Scheme.objects.in_bulk(page)
+    return len(ranked), [(by_id[scheme_id], scores[scheme_id]) for scheme_id in page]
@@ -0,0 +1,262 @@
+import hashlib
+import importlib.util
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .http_client import get_client
+from .models import Scheme, ScrapedPage
+
+logger = logging.getLogger(__name__)
+
+SOURCE_URL = "https://www.india.gov.in/topics/agriculture"
+
+# lxml's C parser is several times faster than html.parser on these pages;
+# fall back when it isn't installed
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Drupal views pager links; only followed within the listing's own path
+PAGER_SELECTOR = ".pager a[href], .pagination a[href], a[rel='next']"
+
+# A listing page answering these no longer exists; it is dropped, not retried
+GONE_STATUSES = (404, 410)
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _source_url():
+    return getattr(settings, "SCHEMES_SOURCE_URL", SOURCE_URL)
+
+
+def parse_row(item, page_url):
+    # Scheme fields from one .views-row, or None when it has no title link
+    # Title + Link
+    title_tag = item.select_one(".views-field-title a")
+    if not title_tag or not title_tag.get("href"):   # skip if no title
+        return None
+
+    # Description (optional)
+    desc_tag = item.select_one(".views-field-body p")
+    return {
+        "title": title_tag.get_text(strip=True),
+        "official_link": urljoin(page_url, title_tag["href"]),
+        "description": desc_tag.get_text(strip=True) if desc_tag else "Description not available",
+        "benefits": ["Details available on official site"],
+    }
+
+
+def _pager_links(soup, page_url):
+    source = urlparse(_source_url())
+    links = []
+    for tag in soup.select(PAGER_SELECTOR):
+        url = urljoin(page_url, tag["href"]).split("#")[0]
+        parsed = urlparse(url)
+        if parsed.netloc == source.netloc and parsed.path == source.path:
+            links.append(url)
+    return links
+
+
+def _not_modified(result, page):
+    # An unchanged page still lists what it listed last time
+    result["status"] = 304
+    if page is not None:
+        result["links"] = list(page.pager_links)
+        result["scheme_links"] = list(page.scheme_links)
+    return result
+
+
+def _fetch_page(url, page):
+    # Runs on the fetch pool: conditional GET, then split a changed body into
+    # (link, row hash, row) triples without extracting fields yet
+    headers = {"User-Agent": "Mozilla/5.0"}  # helps avoid blocking
+    if page is not None:
+        if page.etag:
+            headers["If-None-Match"] = page.etag
+        if page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+    response = get_client("india_gov").get(url, headers=headers)
+    result = {"url": url, "status": response.status_code, "rows": [], "links": [], "scheme_links": []}
+    if response.status_code == 304:
+        return _not_modified(result, page)
+    if response.status_code in GONE_STATUSES and url != _source_url():
+        return result
+    response.raise_for_status()
+
+    result.update(
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        content_hash=_hash(response.text),
+    )
+    # Servers without validators still get a cheap skip when the body is identical
+    if page is not None and page.content_hash == result["content_hash"]:
+        return _not_modified(result, page)
+
+    soup = BeautifulSoup(response.text, HTML_PARSER)
+    for item in soup.select(".views-row"):
+        title_tag = item.select_one(".views-field-title a")
+        if title_tag and title_tag.get("href"):
+            result["rows"].append((urljoin(url, title_tag["href"]), _hash(str(item)), item))
+    result["scheme_links"] = [link for link, _, _ in result["rows"]]
+    result["links"] = _pager_links(soup, url)
+    return result
+
+
+def _crawl(stats):
+    # Fetches the first page plus every listing page seen before or discovered
+    # through pager links, SCHEMES_SCRAPE_WORKERS at a time. Also returns whether
+    # SCHEMES_MAX_PAGES left any page unfetched.
+    source = _source_url()
+    known = {page.url: page for page in ScrapedPage.objects.all()}
+    max_pages = getattr(settings, "SCHEMES_MAX_PAGES", 50)
+    seen = list(dict.fromkeys([source, *known]))
+    truncated = len(seen) > max_pages
+    seen = seen[:max_pages]
+    results = []
+
+    with ThreadPoolExecutor(max_workers=getattr(settings, "SCHEMES_SCRAPE_WORKERS", 4)) as pool:
+        futures = {pool.submit(_fetch_page, url, known.get(url)): url for url in seen}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    if url == source:
+                        raise
+                    logger.exception("Could not fetch scheme page %s", url)
+                    stats["failed"] += 1
+                    continue
+                results.append(result)
+                for link in result["links"]:
+                    if link in seen:
+                        continue
+                    if len(seen) >= max_pages:
+                        truncated = True
+                        continue
+                    seen.append(link)
+                    futures[pool.submit(_fetch_page, link, known.get(link))] = link
+    return results, truncated
+
+
+def _prune(results):
+    # Only after a crawl that fetched every page: drop listing pages no longer
+    # reachable from the source through pager links, and schemes that none of
+    # the reachable pages list. Returns the number of schemes removed.
+    pages = {result["url"]: result for result in results if result["status"] not in GONE_STATUSES}
+    reachable, queue = set(), [_source_url()]
+    while queue:
+        url = queue.pop()
+        if url in reachable or url not in pages:
+            continue
+        reachable.add(url)
+        queue.extend(pages[url]["links"])
+    listed = {link for url in reachable for link in pages[url]["scheme_links"]}
+    # A listing with no schemes at all is more likely a layout change than an
+    # empty catalog; keep everything rather than wipe it
+    if not listed:
+        return 0
+
+    ScrapedPage.objects.exclude(url__in=reachable).delete()
+    stale = [pk for pk, link in Scheme.objects.values_list("id", "official_link") if link not in listed]
+    Scheme.objects.filter(id__in=stale).delete()
+    return len(stale)
+
+
+def refresh_schemes():
+    # Incremental refresh: unchanged pages (304 or identical body) are not parsed,
+    # and only rows whose HTML hash changed are re-extracted and upserted.
+    # Schemes no longer listed are removed when every page was fetched.
+    from .scheme_search import update_search_vectors
+
+    stats = {
+        "pages": 0, "not_modified": 0, "failed": 0, "created": 0, "updated": 0, "unchanged": 0, "removed": 0,
+    }
+    results, truncated = _crawl(stats)
+
+    rows = {link: (row_hash, item, result["url"]) for result in results for link, row_hash, item in result["rows"]}
+    stored = dict(Scheme.objects.filter(official_link__in=list(rows)).values_list("official_link", "content_hash"))
+
+    with transaction.atomic():
+        for link, (row_hash, item, page_url) in rows.items():
+            if stored.get(link) == row_hash:
+                stats["unchanged"] += 1
+                continue
+            row = parse_row(item, page_url)
+            row.pop("official_link")
+            _, was_created = Scheme.objects.update_or_create(
+                official_link=link, defaults={**row, "content_hash": row_hash}
+            )
+            stats["created" if was_created else "updated"] += 1
+
+        for result in results:
+            stats["pages"] += 1
+            if result["status"] == 304:
+                stats["not_modified"] += 1
+                continue
+            if result["status"] in GONE_STATUSES:
+                ScrapedPage.objects.filter(url=result["url"]).delete()
+                continue
+            ScrapedPage.objects.update_or_create(url=result["url"], defaults={
+                "etag": result["etag"],
+                "last_modified": result["last_modified"],
+                "content_hash": result["content_hash"],
+                "scheme_links": result["scheme_links"],
+                "pager_links": result["links"],
+            })
+
+        if not truncated and not stats["failed"]:
+            stats["removed"] = _prune(results)
+
+        if stats["created"] or stats["updated"]:
+            update_search_vectors()
+    logger.info("Scheme catalog refreshed: %s", stats)
+    return stats
+
+
+def serialize(scheme):
+    # Same shape the scraper used to return straight to GovSchemes.jsx
+    desc = scheme.description
+    return {
+        "id": scheme.id,
+        "title": scheme.title,
+        "shortDescription": desc[:150] + ("..." if len(desc) > 150 else ""),
+        "fullDescription": desc,
+        "officialLink": scheme.official_link,
+        "department": scheme.department,
+        "category": scheme.category,
+        "state": scheme.state,
+        "eligibility": scheme.eligibility,
+        "benefits": scheme.benefits,
+        "howToApply": scheme.how_to_apply,
+        "helpline": scheme.helpline,
+        "email": scheme.email,
+        "lastUpdated": scheme.updated_at.strftime("%Y-%m-%d"),
+    }
+
+
+_BOOTSTRAP_LOCK = threading.Lock()
+
+
+def ensure_catalog():
+    # First request on an empty catalog scrapes once so the page isn't blank
+    # before `manage.py refresh_schemes` has run
+    if Scheme.objects.exists() or not getattr(settings, "SCHEMES_BOOTSTRAP_ON_REQUEST", True):
+        return
+    with _BOOTSTRAP_LOCK:
+        if not Scheme.objects.exists():
+            refresh_schemes()
+
+
+def catalog_state():
+    # (last change, row count) of the whole catalog, for ETag / Last-Modified
+    state = Scheme.objects.aggregate(last=Max("updated_at"), count=Count("id"))
+    return state["last"], state["count"]
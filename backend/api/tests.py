@@ -1,3 +1,748 @@
-from django.test import TestCase
+import functools
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from .checks import job_state_cache_check
+from .jobs import FileLock
+from .ml import crop_model, disease_model, fertilizer_model, yield_model
+from .ml.forest_engine import CompiledForest
+from .ml.runtime import ArtifactRegistry
+from .models import Scheme, ScrapedPage
+from .views import MAX_BATCH_ROWS
+
+
+@functools.lru_cache(maxsize=None)
+def _trained(module):
+    # Fitted once per test run from the bundled CSV; never written to the artifact path
+    return module._build_pipeline(module._load_dataset())
+
+
+def _upload(image, fmt, **params):
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, **params)
+    buf.name = f"leaf.{fmt.lower()}"
+    buf.seek(0)
+    return buf
+
+
+@override_settings(DISEASE_BACKEND="remote", HF_API_TOKEN="test-token", DISEASE_CACHE_TTL=0, DISEASE_IMAGE_SIZE=224)
+class DiseaseUploadTests(SimpleTestCase):
+    # Inference is mocked; these cover decoding the upload down to the model input
+
+    def setUp(self):
+        self.prepared = []
+
+        def classify(image):
+            self.prepared.append(image)
+            return [{"label": "Tomato___healthy", "score": 0.9}]
+
+        patcher = mock.patch.object(disease_model, "classify_image", side_effect=classify)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, upload):
+        return self.client.post("/api/disease-detect/", {"image": upload})
+
+    def assertPrepared(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        image = self.prepared[-1]
+        self.assertEqual((image.mode, image.size), ("RGB", (224, 224)))
+        return image
+
+    def test_palette_png(self):
+        image = Image.new("RGB", (1200, 900), (0, 153, 51)).convert("P")
+        prepared = self.assertPrepared(self.post(_upload(image, "PNG")))
+        self.assertEqual(prepared.getpixel((112, 112)), (0, 153, 51))
+
+    def test_palette_gif(self):
+        image = Image.new("RGB", (1200, 900), (20, 140, 30)).convert("P")
+        self.assertPrepared(self.post(_upload(image, "GIF")))
+
+    def test_rgba_png_is_flattened_onto_white(self):
+        image = Image.new("RGBA", (1200, 900), (20, 140, 30, 255))
+        image.paste((0, 0, 0, 0), (0, 0, 600, 900))
+        prepared = self.assertPrepared(self.post(_upload(image, "PNG")))
+        self.assertEqual(prepared.getpixel((10, 112)), (255, 255, 255))
+        self.assertEqual(prepared.getpixel((214, 112)), (20, 140, 30))
+
+    def test_cmyk_jpeg(self):
+        image = Image.new("CMYK", (1200, 900), (0, 0, 0, 0))
+        self.assertPrepared(self.post(_upload(image, "JPEG")))
+
+    def test_exif_rotated_jpeg(self):
+        # Stored landscape with red on top; orientation 6 displays it rotated 90
+        # degrees clockwise, so the red half ends up on the right
+        image = Image.new("RGB", (1200, 600), (0, 0, 255))
+        image.paste((255, 0, 0), (0, 0, 1200, 300))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        prepared = self.assertPrepared(self.post(_upload(image, "JPEG", exif=exif)))
+        left, right = prepared.getpixel((20, 112)), prepared.getpixel((204, 112))
+        self.assertGreater(left[2], 200)
+        self.assertGreater(right[0], 200)
+
+    def test_undecodable_upload_is_bad_request(self):
+        response = self.post(io.BytesIO(b"not an image"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Could not decode image")
+
+    def test_runtime_failure_is_not_blamed_on_the_upload(self):
+        image = Image.new("RGB", (640, 480))
+        with mock.patch.object(disease_model, "image_size", side_effect=RuntimeError("model missing")):
+            with self.assertRaises(RuntimeError):
+                self.post(_upload(image, "PNG"))
+
+
+class CompiledForestParityTests(SimpleTestCase):
+    # The flat-array engine must agree with the sklearn Pipeline it was compiled from
+
+    def assertParity(self, pipeline, X):
+        expected = pipeline.predict_proba(X)
+        got = CompiledForest(pipeline).predict_proba(X)
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-12)
+
+    def _edge_rows(self, pipeline, rows):
+        # NaNs (imputed), extremes, and every feature sitting exactly on a root split
+        numeric = [c for c in rows.columns if pd.api.types.is_numeric_dtype(rows[c])]
+        edge = pd.concat([rows.iloc[:1]] * 4, ignore_index=True)
+        edge.loc[0, numeric] = np.nan
+        edge.loc[1, numeric] = 1e9
+        edge.loc[2, numeric] = -1e9
+        edge.loc[3, numeric] = 0.0
+        # The numeric columns come first in the preprocessed matrix
+        for est in pipeline.named_steps["model"].estimators_[:20]:
+            feature = est.tree_.feature[0]
+            if feature < len(numeric):
+                row = rows.iloc[:1].copy()
+                row[numeric[feature]] = est.tree_.threshold[0]
+                edge = pd.concat([edge, row], ignore_index=True)
+        return edge
+
+    def test_crop_forest(self):
+        pipeline, meta = _trained(crop_model)
+        rows = crop_model._load_dataset()[meta["numeric_features"]]
+        self.assertParity(pipeline, rows.iloc[:300])
+        self.assertParity(pipeline, rows.iloc[[7]])
+        self.assertParity(pipeline, self._edge_rows(pipeline, rows))
+
+    def test_fertilizer_forest(self):
+        pipeline, meta = _trained(fertilizer_model)
+        rows = fertilizer_model._load_dataset()[meta["numeric_features"] + meta["categorical_features"]]
+        self.assertParity(pipeline, rows.iloc[:300])
+        self.assertParity(pipeline, rows.iloc[[7]])
+        edge = self._edge_rows(pipeline, rows)
+        edge.loc[0, meta["categorical_features"]] = ["Unknown soil", "Unknown crop"]
+        self.assertParity(pipeline, edge)
+
+
+def _use_model(module):
+    # Serve from the in-memory fit instead of loading or training an artifact
+    patcher = mock.patch.multiple(module, _MODEL_SINGLETON=_trained(module), _ENGINE_SINGLETON=None)
+    patcher.start()
+    return patcher
+
+
+@override_settings(ML_PREDICTION_CACHE_TTL=0)
+class CropBatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(_use_model(crop_model).stop)
+        rows = crop_model._load_dataset().sample(40, random_state=0)
+        self.payloads = [
+            {"nitrogen": r.Nitrogen, "phosphorus": r.Phosphorus, "potassium": r.Potassium,
+             "temperature": r.Temperature, "humidity": r.Humidity, "ph": r.pH, "rainfall": r.Rainfall}
+            for r in rows.itertuples()
+        ]
+
+    def assertBatchMatchesSingles(self):
+        singles = [
+            self.client.post("/api/crop/recommend/", payload, content_type="application/json").json()
+            for payload in self.payloads
+        ]
+        response = self.client.post(
+            "/api/crop/recommend/batch/", {"items": self.payloads, "top_k": 3}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body["count"], len(self.payloads))
+        for single, batched in zip(singles, body["results"]):
+            self.assertEqual(batched["crop"], single["crop"])
+            self.assertEqual(batched["confidence"], single["confidence"])
+            self.assertEqual(batched["meta"], single["meta"])
+            self.assertEqual(batched["top_k"][0], {"crop": single["crop"], "confidence": single["confidence"]})
+            self.assertEqual(len(batched["top_k"]), 3)
+
+    def test_batch_matches_single_requests(self):
+        self.assertBatchMatchesSingles()
+
+    def test_batch_matches_single_requests_on_flat_engine(self):
+        with mock.patch.object(crop_model, "_ENGINE_SINGLETON", CompiledForest(_trained(crop_model)[0])):
+            self.assertBatchMatchesSingles()
+
+    def test_missing_fields_are_imputed_and_reported_as_null(self):
+        response = self.client.post(
+            "/api/crop/recommend/batch/", [{"nitrogen": 90, "ph": "n/a"}], content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        used = response.json()["results"][0]["meta"]["used_features"]
+        self.assertEqual(used["Nitrogen"], 90.0)
+        self.assertIsNone(used["pH"])
+
+    def test_rejects_empty_and_oversized_batches(self):
+        response = self.client.post("/api/crop/recommend/batch/", {"items": []}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            "/api/crop/recommend/batch/", [{}] * (MAX_BATCH_ROWS + 1), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_items_that_are_not_objects(self):
+        response = self.client.post(
+            "/api/crop/recommend/batch/", [self.payloads[0], "nitrogen=90"], content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Item 1: expected an object")
+
+
+@override_settings(ML_PREDICTION_CACHE_TTL=0)
+class FertilizerBatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.addCleanup(_use_model(fertilizer_model).stop)
+        rows = fertilizer_model._load_dataset().sample(40, random_state=0)
+        self.payloads = [
+            {"temperature": r.Temperature, "humidity": r.Humidity, "moisture": r.Moisture,
+             "nitrogen": r.Nitrogen, "potassium": r.Potassium, "phosphorus": r.Phosphorus,
+             "soil": r.SoilType.lower(), "crop": f" {r.CropType} "}
+            for r in rows.itertuples()
+        ]
+        # Only NPK and crop, as the UI sends it: the other numerics take their defaults
+        self.payloads.append({"N": 10, "P": 20, "K": 5, "crop": "paddy"})
+
+    def test_batch_and_stream_match_single_requests(self):
+        singles = [
+            self.client.post("/api/fertilizer/recommend/", payload, content_type="application/json").json()
+            for payload in self.payloads
+        ]
+        response = self.client.post(
+            "/api/fertilizer/recommend/batch/", {"items": self.payloads}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {"count": len(singles), "results": singles})
+
+        response = self.client.post(
+            "/api/fertilizer/recommend/batch/?stream=1", self.payloads, content_type="application/json"
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], singles)
+
+    def test_rejects_items_that_are_not_objects(self):
+        items = [self.payloads[0], ["N", 10], self.payloads[1]]
+        for url in ("/api/fertilizer/recommend/batch/", "/api/fertilizer/recommend/batch/?stream=1"):
+            with self.subTest(url=url):
+                response = self.client.post(url, items, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["error"], "Item 1: expected an object")
+
+
+@override_settings(ML_PREDICTION_CACHE_TTL=0, ML_TRAIN_ON_REQUEST=False)
+class MissingArtifactTests(SimpleTestCase):
+    # Without ML_TRAIN_ON_REQUEST every model endpoint answers like the yield ones
+
+    def setUp(self):
+        missing = str(Path(tempfile.mkdtemp()) / "missing.joblib")
+        self.addCleanup(shutil.rmtree, Path(missing).parent)
+        for module in (crop_model, fertilizer_model):
+            patcher = mock.patch.multiple(
+                module, _MODEL_SINGLETON=None, _ENGINE_SINGLETON=None, _get_cache_path=lambda: missing
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_crop_and_fertilizer_report_model_not_trained(self):
+        payload = {"N": 10, "P": 20, "K": 5, "crop": "paddy"}
+        for url, body in (
+            ("/api/crop/recommend/", payload),
+            ("/api/crop/recommend/batch/", [payload]),
+            ("/api/fertilizer/recommend/", payload),
+            ("/api/fertilizer/recommend/batch/", [payload]),
+            ("/api/fertilizer/recommend/batch/?stream=1", [payload]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.post(url, body, content_type="application/json")
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response.json()["code"], "MODEL_NOT_TRAINED")
+
+
+def _scheme(title, description="", **fields):
+    slug = title.lower().replace(" ", "-")
+    return Scheme.objects.create(
+        title=title, description=description, official_link=f"https://example.gov.in/{slug}", **fields
+    )
+
+
+@override_settings(SCHEMES_BOOTSTRAP_ON_REQUEST=False)
+class SchemeCatalogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        _scheme("PM Kisan Samman Nidhi")
+        _scheme("Soil Health Card")
+        _scheme("Punjab Crop Residue Scheme", state="Punjab")
+        _scheme("Kerala Coconut Mission", state="Kerala", category="Horticulture")
+        _scheme("Kerala Paddy Bonus", state="Kerala")
+
+    def get(self, **params):
+        return self.client.get("/api/scrape-schemes/", params)
+
+    def titles(self, response):
+        return [row["title"] for row in response.json()]
+
+    def test_state_filter_includes_central_schemes(self):
+        response = self.get(state="kerala")
+        self.assertEqual(self.titles(response), [
+            "PM Kisan Samman Nidhi", "Soil Health Card", "Kerala Coconut Mission", "Kerala Paddy Bonus",
+        ])
+        self.assertEqual(response["X-Total-Count"], "4")
+
+    def test_category_filter(self):
+        response = self.get(state="Kerala", category="horticulture")
+        self.assertEqual(self.titles(response), ["Kerala Coconut Mission"])
+
+    def test_paging_keeps_the_unpaged_total(self):
+        response = self.get(page=2, page_size=2)
+        self.assertEqual(self.titles(response), ["Punjab Crop Residue Scheme", "Kerala Coconut Mission"])
+        self.assertEqual(response["X-Total-Count"], "5")
+        self.assertEqual(self.get(page="two").status_code, 400)
+
+    def test_total_count_is_readable_cross_origin(self):
+        # GovSchemes.jsx (a different origin in dev) pages with it
+        response = self.client.get("/api/scrape-schemes/", {"page": 1}, HTTP_ORIGIN="http://localhost:5173")
+        self.assertIn("X-Total-Count", response["Access-Control-Expose-Headers"])
+
+    def test_unpaged_request_returns_the_whole_catalog(self):
+        response = self.get()
+        self.assertEqual(len(response.json()), 5)
+        self.assertEqual(response.json()[0]["officialLink"], "https://example.gov.in/pm-kisan-samman-nidhi")
+
+    def test_conditional_get(self):
+        first = self.get(state="Kerala")
+        etag = first["ETag"]
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        again = self.client.get("/api/scrape-schemes/", {"state": "Kerala"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        # Filters and paging are part of the representation
+        self.assertNotEqual(self.get(state="Punjab")["ETag"], etag)
+
+        scheme = Scheme.objects.get(title="Soil Health Card")
+        scheme.description = "Updated"
+        scheme.save()
+        changed = self.client.get("/api/scrape-schemes/", {"state": "Kerala"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_refresh_command_every_survives_a_failed_round(self):
+        from django.core.management import call_command
+
+        stats = dict(created=0, updated=1, unchanged=4, removed=0, pages=1, not_modified=0, failed=0)
+        refresh = mock.Mock(side_effect=[RuntimeError("upstream down"), stats])
+        sleep = mock.Mock(side_effect=[None, KeyboardInterrupt])
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch("api.management.commands.refresh_schemes.refresh_schemes", refresh), \
+                mock.patch("api.management.commands.refresh_schemes.time.sleep", sleep):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("refresh_schemes", every=60, stdout=out, stderr=err)
+        self.assertEqual(refresh.call_count, 2)
+        sleep.assert_called_with(60)
+        self.assertIn("upstream down", err.getvalue())
+        self.assertIn("1 updated", out.getvalue())
+
+
+SOURCE = "https://www.india.gov.in/topics/agriculture"
+
+
+def _listing(*titles, next_page=None):
+    rows = "".join(
+        f'<div class="views-row"><div class="views-field-title"><a href="/{t.lower()}">{t}</a></div>'
+        f'<div class="views-field-body"><p>About {t}</p></div></div>'
+        for t in titles
+    )
+    pager = f'<ul class="pager"><a href="?page={next_page}">next</a></ul>' if next_page else ""
+    return f"<html><body>{rows}{pager}</body></html>"
+
+
+class FakeIndiaGov:
+    # Stands in for the india_gov client: url -> (etag, html), or a bare status code
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, headers=None):
+        page = self.pages.get(url, 404)
+        response = mock.Mock(headers={}, text="")
+        if isinstance(page, int):
+            response.status_code = page
+            response.raise_for_status.side_effect = None if page < 400 else RuntimeError(page)
+            return response
+        etag, html = page
+        response.status_code = 304 if (headers or {}).get("If-None-Match") == etag else 200
+        response.headers = {"ETag": etag}
+        response.text = html
+        return response
+
+
+@override_settings(SCHEMES_SOURCE_URL=SOURCE, SCHEMES_BOOTSTRAP_ON_REQUEST=False)
+class SchemeRefreshTests(TestCase):
+
+    def crawl(self, pages):
+        from .schemes import refresh_schemes
+
+        with mock.patch("api.schemes.get_client", return_value=FakeIndiaGov(pages)):
+            return refresh_schemes()
+
+    def titles(self):
+        return sorted(Scheme.objects.values_list("title", flat=True))
+
+    def test_schemes_and_pages_that_disappear_are_pruned(self):
+        page_1 = f"{SOURCE}?page=1"
+        stats = self.crawl({SOURCE: ("v1", _listing("Alpha", "Beta", next_page=1)), page_1: ("v1", _listing("Gamma"))})
+        self.assertEqual(stats["created"], 3)
+        self.assertEqual(self.titles(), ["Alpha", "Beta", "Gamma"])
+
+        # Gamma is gone from page 1; the unchanged first page (304) still vouches for its schemes
+        stats = self.crawl({SOURCE: ("v1", _listing("Alpha", "Beta", next_page=1)), page_1: ("v2", _listing("Delta"))})
+        self.assertEqual((stats["not_modified"], stats["created"], stats["removed"]), (1, 1, 1))
+        self.assertEqual(self.titles(), ["Alpha", "Beta", "Delta"])
+
+        # The pager page itself disappears
+        stats = self.crawl({SOURCE: ("v3", _listing("Alpha", "Beta")), page_1: 404})
+        self.assertEqual((stats["failed"], stats["removed"]), (0, 1))
+        self.assertEqual(self.titles(), ["Alpha", "Beta"])
+        self.assertEqual(list(ScrapedPage.objects.values_list("url", flat=True)), [SOURCE])
+
+    def test_nothing_is_pruned_after_a_partial_crawl(self):
+        page_1 = f"{SOURCE}?page=1"
+        self.crawl({SOURCE: ("v1", _listing("Alpha", next_page=1)), page_1: ("v1", _listing("Gamma"))})
+
+        with self.assertLogs("api.schemes", "ERROR"):
+            stats = self.crawl({SOURCE: ("v2", _listing("Beta", next_page=1)), page_1: 500})
+        self.assertEqual((stats["failed"], stats["removed"]), (1, 0))
+        self.assertEqual(self.titles(), ["Alpha", "Beta", "Gamma"])
+
+
+@override_settings(SCHEMES_BOOTSTRAP_ON_REQUEST=False)
+class SchemeSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        from .scheme_search import update_search_vectors
+
+        _scheme("Pradhan Mantri Fasal Bima Yojana", "Crop insurance for farmers against yield losses.")
+        _scheme("Punjab Crop Residue Scheme", "Machines for managing paddy straw.", state="Punjab")
+        _scheme("PM Kusum", "Solar pumps for irrigation.")
+        _scheme("Kerala Coconut Mission", "Support for coconut growers.", state="Kerala")
+        update_search_vectors()
+
+    def search(self, **params):
+        response = self.client.get("/api/schemes/search/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_best_match_first(self):
+        body = self.search(q="crop insurance")
+        self.assertEqual(body["results"][0]["title"], "Pradhan Mantri Fasal Bima Yojana")
+        self.assertEqual(body["count"], 2)
+
+    def test_hindi_and_romanized_terms(self):
+        for query in ("फसल बीमा", "fasal bima", "sinchai"):
+            titles = [row["title"] for row in self.search(q=query)["results"]]
+            expected = "PM Kusum" if query == "sinchai" else "Pradhan Mantri Fasal Bima Yojana"
+            self.assertEqual(titles[:1], [expected], query)
+
+    def test_filters_and_paging(self):
+        body = self.search(q="crop", state="Kerala")
+        self.assertEqual([row["title"] for row in body["results"]], ["Pradhan Mantri Fasal Bima Yojana"])
+        body = self.search(q="crop", page=2, page_size=1)
+        self.assertEqual((body["count"], len(body["results"])), (2, 1))
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get("/api/schemes/search/", {"q": " "}).status_code, 400)
+
+
+class JobStateCacheCheckTests(SimpleTestCase):
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://x"}}
+
+    def test_warns_on_locmem_outside_debug(self):
+        with override_settings(DEBUG=False, CACHES=self.LOCMEM):
+            self.assertEqual([m.id for m in job_state_cache_check(None)], ["api.W001"])
+        with override_settings(DEBUG=True, CACHES=self.LOCMEM):
+            self.assertEqual(job_state_cache_check(None), [])
+        with override_settings(DEBUG=False, CACHES=self.REDIS):
+            self.assertEqual(job_state_cache_check(None), [])
+
+
+class YieldTrainingJobTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(yield_model, "MODEL_PATH", Path(tmp.name) / "yield_model.joblib")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_file_lock_is_exclusive(self):
+        path = yield_model.training_lock_path()
+        first, second = FileLock(path), FileLock(path)
+        self.assertTrue(first.acquire("job-1"))
+        self.assertFalse(second.acquire("job-2"))
+        self.assertEqual(second.owner(), "job-1")
+        first.release()
+        self.assertIsNone(second.owner())
+        self.assertTrue(second.acquire("job-2"))
+        second.release()
+
+    def test_second_training_request_gets_409(self):
+        release = threading.Event()
+
+        def fake_training(force, progress):
+            release.wait(10)
+            return {"status": "trained"}
+
+        def train():
+            return self.client.post("/api/yield/train/", {"force": True}, content_type="application/json")
+
+        with mock.patch("api.ml.training.train_yield_in_subprocess", fake_training):
+            first = train()
+            self.assertEqual(first.status_code, 202, first.content)
+            job_id = first.json()["job_id"]
+
+            second = train()
+            self.assertEqual(second.status_code, 409)
+            self.assertEqual(second.json()["job_id"], job_id)
+            self.assertEqual(second.json()["status_url"], f"/api/yield/train/jobs/{job_id}/")
+
+            release.set()
+            deadline = time.monotonic() + 10
+            while self.client.get(f"/api/yield/train/jobs/{job_id}/").json()["status"] != "done":
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.05)
+            self.assertEqual(train().status_code, 202)
+
+
+@override_settings(YIELD_MODEL_BACKEND="forest", YIELD_TABLE_YEARS_AHEAD=5)
+class YieldModelTestCase(SimpleTestCase):
+    # Trains the configured backend on a small crop_production-shaped CSV in a
+    # temp dir, with the module paths and registry pointed at it for the class
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        tmp = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, tmp, ignore_errors=True)
+
+        rng = np.random.default_rng(0)
+        rows = 1500
+        crops = rng.choice(["Rice", "Wheat", "Maize"], rows)
+        area = rng.uniform(10, 1000, rows).round(1)
+        pd.DataFrame({
+            "State_Name": "Bihar",
+            "District_Name": "Patna",
+            "Crop_Year": rng.integers(2000, 2011, rows),
+            "Season": rng.choice(["Kharif     ", "Rabi       "], rows),
+            "Crop": crops,
+            "Area": area,
+            "Production": (area * np.select([crops == "Rice", crops == "Wheat"], [2.5, 3.0], 2.8)
+                           * rng.lognormal(0, 0.2, rows)).round(2),
+        }).to_csv(tmp / "crop_production.csv", index=False)
+
+        model_path = tmp / "yield_model.joblib"
+        patcher = mock.patch.multiple(
+            yield_model, DATA_PATH=tmp / "crop_production.csv", DATASET_CACHE_DIR=tmp / "cache",
+            MODEL_PATH=model_path, _REGISTRY=ArtifactRegistry(model_path, yield_model._load_bundle),
+        )
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        if yield_model._model_backend() == "forest":
+            # A smaller forest keeps the suite quick; the scoring paths are the same
+            with mock.patch.object(yield_model, "_build_forest_pipeline", cls._small_forest):
+                yield_model.train_and_save(force=True)
+        else:
+            yield_model.train_and_save(force=True)
+
+    @staticmethod
+    def _small_forest(build=yield_model._build_forest_pipeline):
+        pipeline = build()
+        pipeline.named_steps["regressor"].set_params(n_estimators=30)
+        return pipeline
+
+    def model_scores(self, crop, season, year, area=1.0):
+        # Straight from the pipeline, bypassing the lookup table
+        bundle = yield_model._get_bundle()
+        X = pd.DataFrame({"crop": [crop], "season": [season], "year": [year]})
+        stats = yield_model._score_rows(bundle["pipeline"], X, bundle["table"]["coverage"])
+        return yield_model._yield_results(stats, np.array([area]))[0]
+
+
+class YieldLookupTests(YieldModelTestCase):
+
+    def test_table_covers_training_years_and_years_ahead(self):
+        table = yield_model._get_bundle()["table"]
+        self.assertEqual(table["crops"], ["maize", "rice", "wheat"])
+        self.assertEqual(table["seasons"], ["Kharif", "Rabi"])
+        self.assertEqual((table["first_year"], table["values"].shape[2]), (2000, 16))
+
+    def test_table_matches_the_model(self):
+        for crop, season, year in (("Rice", "kharif ", 2000), ("wheat", "Rabi", 2010), ("Maize", "Rabi", 2015)):
+            result = yield_model.predict_yield(crop, season, year, 2.5)
+            self.assertEqual(result, self.model_scores(crop.strip().lower(), season.strip().title(), year, 2.5))
+
+    def test_keys_outside_the_table_fall_back_to_the_model(self):
+        for crop, season, year in (("rice", "Kharif", 1995), ("rice", "Kharif", 2030),
+                                   ("jute", "Kharif", 2005), ("rice", "Summer", 2005)):
+            result = yield_model.predict_yield(crop, season, year, 1.0)
+            self.assertEqual(result, self.model_scores(crop, season, year))
+            self.assertGreater(result["yieldPerHa"], 0)
+
+    def test_artifact_without_table(self):
+        bundle = {**yield_model._get_bundle(), "table": None}
+        with_table = yield_model._score(yield_model._get_bundle(), ["rice"], ["Kharif"], [2004])
+        without = yield_model._score(bundle, ["rice"], ["Kharif"], [2004])
+        np.testing.assert_allclose(without, with_table)
+
+    def test_prediction_endpoint(self):
+        response = self.client.post(
+            "/api/yield/predict/", {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": 2},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body, yield_model.predict_yield("Rice", "Kharif", 2005, 2))
+        self.assertLessEqual(body["yieldLow"], body["yieldPerHa"])
+        self.assertLessEqual(body["yieldPerHa"], body["yieldHigh"])
+
+    def test_untrained_model_is_503(self):
+        missing = yield_model.MODEL_PATH.with_name("missing.joblib")
+        with mock.patch.object(yield_model, "_REGISTRY", ArtifactRegistry(missing, yield_model._load_bundle)):
+            response = self.client.post(
+                "/api/yield/predict/", {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": 2},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["code"], "MODEL_NOT_TRAINED")
+
+
+class YieldBatchTests(YieldModelTestCase):
+    PLOTS = [
+        {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": 1.5},
+        {"crop": " RICE ", "season": "kharif", "year": "2005", "area": 2},
+        {"cropName": "Wheat", "season": "Rabi", "year": 2012, "area": 0.75},
+        {"cropName": "Jute", "season": "Kharif", "year": 2005, "area": 1},
+        {"cropName": "Rice", "season": "Kharif", "year": 1995, "area": 3},
+    ]
+
+    def post(self, items):
+        return self.client.post("/api/yield/predict/batch/", {"items": items}, content_type="application/json")
+
+    def test_batch_matches_single_predictions(self):
+        response = self.post(self.PLOTS)
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body["count"], len(self.PLOTS))
+        expected = [
+            yield_model.predict_yield(plot.get("cropName") or plot["crop"], plot["season"], plot["year"], plot["area"])
+            for plot in self.PLOTS
+        ]
+        self.assertEqual(body["results"], expected)
+
+    def test_groups_and_totals(self):
+        body = self.post(self.PLOTS).json()
+        results = body["results"]
+        # Case and whitespace variants of a crop/season land in one group, across years
+        self.assertEqual([(g["crop"], g["season"], g["plots"]) for g in body["groups"]],
+                         [("rice", "Kharif", 3), ("wheat", "Rabi", 1), ("jute", "Kharif", 1)])
+        rice = body["groups"][0]
+        self.assertEqual(rice["area"], 6.5)
+        self.assertAlmostEqual(rice["totalYield"], sum(results[i]["totalYield"] for i in (0, 1, 4)), delta=0.02)
+        self.assertAlmostEqual(rice["yieldPerHa"], rice["totalYield"] / rice["area"], delta=0.01)
+
+        totals = body["totals"]
+        self.assertEqual((totals["plots"], totals["area"]), (5, 8.25))
+        self.assertAlmostEqual(totals["totalYield"], sum(r["totalYield"] for r in results), delta=0.05)
+        self.assertLessEqual(totals["totalYieldLow"], totals["totalYield"])
+        self.assertLessEqual(totals["totalYield"], totals["totalYieldHigh"])
+
+    def test_invalid_plot_is_reported_by_index(self):
+        response = self.post([self.PLOTS[0], {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": 0}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Item 1", response.json()["error"])
+        response = self.post([{"cropName": "Rice", "season": "Kharif", "area": 1}])
+        self.assertIn("Item 0: Missing required fields", response.json()["error"])
+
+    def test_non_finite_areas_are_rejected(self):
+        for area in ("inf", "-inf", "nan", "NaN"):
+            response = self.post([self.PLOTS[0], {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": area}])
+            self.assertEqual(response.status_code, 400, area)
+            self.assertEqual(response.json()["error"], "Item 1: Area must be > 0")
+        response = self.client.post(
+            "/api/yield/predict/", {"cropName": "Rice", "season": "Kharif", "year": 2005, "area": "inf"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(YIELD_MODEL_BACKEND="hgb")
+class HgbYieldBatchTests(YieldBatchTests):
+    # No per-tree spread: bounds and confidence are null rather than invented
+
+    def test_no_interval_without_trees(self):
+        self.assertEqual(yield_model.get_model()[1]["backend"], "hgb")
+        body = self.post(self.PLOTS).json()
+        for result in body["results"]:
+            self.assertIsNone(result["yieldLow"])
+            self.assertIsNone(result["yieldHigh"])
+            self.assertIsNone(result["confidence"])
+        self.assertIsNone(body["totals"]["totalYieldLow"])
+        self.assertIsNone(body["totals"]["totalYieldHigh"])
+
+    def test_groups_and_totals(self):
+        body = self.post(self.PLOTS).json()
+        self.assertEqual(body["totals"]["plots"], 5)
+        self.assertAlmostEqual(
+            body["totals"]["totalYield"], sum(r["totalYield"] for r in body["results"]), delta=0.05
+        )
+
+
+@override_settings(DEBUG=False, DISEASE_BATCH_MAX_SIZE=8)
+class MlCacheStatsTests(TestCase):
+
+    def test_staff_only_outside_debug(self):
+        self.assertEqual(self.client.get("/api/ml/cache-stats/").status_code, 403)
+        self.client.force_login(User.objects.create_user("farmer", password="x"))
+        self.assertEqual(self.client.get("/api/ml/cache-stats/").status_code, 403)
+        self.client.force_login(User.objects.create_user("ops", password="x", is_staff=True))
+        self.assertEqual(self.client.get("/api/ml/cache-stats/").status_code, 200)
+
+    @override_settings(DEBUG=True)
+    def test_open_in_debug(self):
+        self.assertEqual(self.client.get("/api/ml/cache-stats/").status_code, 200)
+
+    def test_reading_stats_does_not_start_the_batcher(self):
+        self.client.force_login(User.objects.create_user("ops", password="x", is_staff=True))
+        with mock.patch.object(disease_model, "_BATCHER_SINGLETON", None):
+            body = self.client.get("/api/ml/cache-stats/").json()
+            self.assertIsNone(body["disease_batching"])
+            self.assertIsNone(disease_model._BATCHER_SINGLETON)
@@ -16,9 +16,17 @@ urlpatterns = [
     path("login/", views.login, name="login"),
     path("weather/", views.get_weather_forecast, name="get_weather_forecast"),
     path("fertilizer/recommend/", views.recommend_fertilizer, name="recommend_fertilizer"),
+    path("fertilizer/recommend/batch/", views.recommend_fertilizer_batch, name="recommend_fertilizer_batch"),
     path("crop/recommend/", views.recommend_crop, name="recommend_crop"),
+    path("crop/recommend/batch/", views.recommend_crop_batch, name="recommend_crop_batch"),
+    path("ml/cache-stats/", views.ml_cache_stats, name="ml_cache_stats"),
     path("scrape-schemes/", views.scrape_schemes, name="scrape_schemes"),
+    path("schemes/search/", views.search_schemes, name="search_schemes"),
     path("yield/train/", views.train_yield_model, name="train_yield_model"),
+    path("yield/train/jobs/<str:job_id>/", views.yield_training_status, name="yield_training_status"),
     path("yield/predict/", views.predict_yield_endpoint, name="predict_yield"),
+    path("yield/predict/batch/", views.predict_yield_batch, name="predict_yield_batch"),
     path("disease-detect/", views.disease_detect, name="disease_detect"),
+    path("disease-detect/jobs/<str:job_id>/", views.disease_job_status, name="disease_job_status"),
+    path("disease-detect/jobs/<str:job_id>/stream/", views.disease_job_stream, name="disease_job_stream"),
 ]
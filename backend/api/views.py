@@ -1,30 +1,36 @@
 import json
+import math
 import os
 import random
 import base64
-import time
+import hashlib
 import tempfile
-import requests
+import time
 from datetime import datetime, timedelta, timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
-from .models import UserProfile
-from dotenv import load_dotenv
+from .models import Scheme, UserProfile
+from . import scheme_search, schemes
+from .http_client import get_client
+from .weather import WeatherError, get_forecast
+from .jobs import QueueFullError, disease_jobs, yield_training_jobs
 from django.contrib.auth import authenticate
 from rest_framework.response import Response
-from .ml.fertilizer_model import predict_from_payload
-from .ml.crop_model import predict_crop_from_payload
-from bs4 import BeautifulSoup
+from .ml.fertilizer_model import predict_from_payload, predict_from_payloads, iter_predictions_from_payloads
+from .ml.crop_model import predict_crop_from_payload, predict_crops_from_payloads
+from .ml import crop_model, disease_model, fertilizer_model
+from .ml.prediction_cache import PredictionCache
 from rest_framework.decorators import api_view, permission_classes, parser_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework import status
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.conf import settings
-from django.http import JsonResponse, HttpResponseBadRequest
-from django.views.decorators.http import require_POST
+from django.http import JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import condition, require_GET, require_POST
+from django.db.models import Q
 
 
 
@@ -54,7 +60,7 @@ def send_otp_sms(phone: str, otp: str) -> bool:
     }
 
     try:
-        r = requests.post(API_URL, json=payload, headers=headers, timeout=10)
+        r = get_client("httpsms").post(API_URL, json=payload, headers=headers)
         print("🔍 Response Status:", r.status_code)
         print("🔍 Response Body:", r.text)
         r.raise_for_status()
@@ -280,7 +286,7 @@ def forgot_password_send_otp(request):
     headers = {"x-api-key": api_key}
 
     try:
-        response = requests.post("https://api.httpsms.com/v1/messages/send", json=payload, headers=headers)
+        response = get_client("httpsms").post("https://api.httpsms.com/v1/messages/send", json=payload, headers=headers)
         if response.status_code == 200:
             return JsonResponse({"success": True, "message": "OTP sent successfully"})
         else:
@@ -325,9 +331,6 @@ def forgot_password_reset(request):
     except UserProfile.DoesNotExist:
         return JsonResponse({"success": False, "error": "User not found"}, status=404)
     
-load_dotenv()
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-
 @api_view(["GET"])
 def get_profile(request):
     """Get user profile data"""
@@ -471,64 +474,17 @@ def update_password(request):
 @api_view(["GET"])
 def get_weather_forecast(request):
     city = request.GET.get("city")
-    if not OPENWEATHER_API_KEY:
+    lat = request.GET.get("lat")
+    lon = request.GET.get("lon")
+    if not settings.OPENWEATHER_API_KEY:
         return Response({"error": "API key not configured"}, status=500)
 
     try:
-        # Step 1: Current weather
-        current_url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHER_API_KEY}&units=metric"
-        current_data = requests.get(current_url).json()
-
-        if "cod" in current_data and current_data["cod"] != 200:
-            return Response({"error": current_data.get("message", "Error fetching current weather")}, status=400)
-
-        # Step 2: 5-day / 3-hour forecast
-        forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?q={city}&appid={OPENWEATHER_API_KEY}&units=metric"
-        forecast_data = requests.get(forecast_url).json()
-
-        if "list" not in forecast_data:
-            return Response({"error": forecast_data.get("message", "Error fetching forecast")}, status=400)
-
-        # Step 3: Group into daily summary
-        daily_forecast = {}
-        for entry in forecast_data["list"]:
-            # Convert timestamp → YYYY-MM-DD string
-            date_str = datetime.fromtimestamp(entry["dt"]).strftime("%Y-%m-%d")
-
-            if date_str not in daily_forecast:
-                daily_forecast[date_str] = {
-                    "min": float(entry["main"]["temp_min"]),
-                    "max": float(entry["main"]["temp_max"]),
-                    "condition": entry["weather"][0]["description"].title(),
-                    "icon": entry["weather"][0]["icon"],
-                    "humidity": int(entry["main"]["humidity"]),
-                    "windSpeed": float(entry["wind"]["speed"])
-                }
-            else:
-                daily_forecast[date_str]["min"] = min(daily_forecast[date_str]["min"], float(entry["main"]["temp_min"]))
-                daily_forecast[date_str]["max"] = max(daily_forecast[date_str]["max"], float(entry["main"]["temp_max"]))
-
-        # Take only 5 days
-        forecast_list = []
-        for date, info in list(daily_forecast.items())[:5]:
-            forecast_list.append({
-                "date": date,
-                **info
-            })
-
-        # Final response
-        return Response({
-            "city": city,
-            "current": {
-                "temp": float(current_data["main"]["temp"]),
-                "condition": current_data["weather"][0]["description"].title(),
-                "humidity": int(current_data["main"]["humidity"]),
-                "windSpeed": float(current_data["wind"]["speed"]),
-                "icon": current_data["weather"][0]["icon"]
-            },
-            "forecast": forecast_list
-        })
-
+        # Cached per city / coordinates; see api/weather.py
+        data = get_forecast(city=city, lat=lat, lon=lon)
+        return Response({**data, "city": city or data.get("city")})
+    except WeatherError as e:
+        return Response({"error": str(e)}, status=e.status)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
@@ -539,6 +495,27 @@ def recommend_fertilizer(request):
         payload = request.data if hasattr(request, "data") else json.loads(request.body or "{}")
         result = predict_from_payload(payload)
         return Response(result)
+    except FileNotFoundError as fnf:
+        return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
+    except Exception as e:
+        return Response({"error": str(e)}, status=400)
+
+
+@api_view(["POST"])
+def recommend_fertilizer_batch(request):
+    try:
+        payload = request.data if hasattr(request, "data") else json.loads(request.body or "{}")
+        if _wants_ndjson(request, payload):
+            items = _batch_items(payload, max_rows=MAX_STREAM_ROWS)
+            # Load before streaming starts so a missing artifact is still a 503
+            fertilizer_model.get_model()
+            lines = (json.dumps(row) + "\n" for row in iter_predictions_from_payloads(items))
+            return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        items = _batch_items(payload)
+        results = predict_from_payloads(items)
+        return Response({"count": len(results), "results": results})
+    except FileNotFoundError as fnf:
+        return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
     except Exception as e:
         return Response({"error": str(e)}, status=400)
 
@@ -549,49 +526,147 @@ def recommend_crop(request):
         payload = request.data if hasattr(request, "data") else json.loads(request.body or "{}")
         result = predict_crop_from_payload(payload)
         return Response(result)
+    except FileNotFoundError as fnf:
+        return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
+    except Exception as e:
+        return Response({"error": str(e)}, status=400)
+
+
+# Upper bound on rows accepted by the batch recommendation and yield endpoints
+MAX_BATCH_ROWS = 10000
+# NDJSON responses are scored chunk by chunk, so they can take larger batches
+MAX_STREAM_ROWS = 100000
+
+
+def _batch_items(payload, max_rows=MAX_BATCH_ROWS):
+    # Accept either a bare JSON list or {"items": [...]}
+    items = payload if isinstance(payload, list) else payload.get("items")
+    if not isinstance(items, list) or not items:
+        raise ValueError("Expected a non-empty list of items")
+    if len(items) > max_rows:
+        raise ValueError(f"Too many items: max {max_rows} per request")
+    return items
+
+
+def _wants_ndjson(request, payload):
+    if request.GET.get("stream") in ("1", "true", "ndjson"):
+        return True
+    if isinstance(payload, dict) and payload.get("stream"):
+        return True
+    return "application/x-ndjson" in request.headers.get("Accept", "")
+
+
+@api_view(["POST"])
+def recommend_crop_batch(request):
+    try:
+        payload = request.data if hasattr(request, "data") else json.loads(request.body or "{}")
+        items = _batch_items(payload)
+        top_k = int(payload.get("top_k", 3)) if isinstance(payload, dict) else 3
+        results = predict_crops_from_payloads(items, top_k=top_k)
+        return Response({"count": len(results), "results": results})
+    except FileNotFoundError as fnf:
+        return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
     except Exception as e:
         return Response({"error": str(e)}, status=400)
     
 
+class IsStaffOrDebug(BasePermission):
+    # Operational endpoints: open in DEBUG, staff accounts only otherwise
+    def has_permission(self, request, view):
+        return settings.DEBUG or bool(request.user and request.user.is_staff)
+
+
+@api_view(["GET"])
+@permission_classes([IsStaffOrDebug])
+def ml_cache_stats(request):
+    # Counters are per worker process. Reads only: the disease batcher is
+    # reported if running, never started from here.
+    batcher = disease_model.current_batcher()
+    return Response({
+        "pid": os.getpid(),
+        "crop": crop_model.cache_stats(),
+        "fertilizer": fertilizer_model.cache_stats(),
+        "disease": _DISEASE_CACHE.stats(),
+        "disease_jobs": disease_jobs.stats(),
+        "disease_batching": batcher.stats() if batcher else None,
+    })
+
+
+def _schemes_last_modified(request):
+    return schemes.catalog_state()[0]
+
+
+def _schemes_etag(request):
+    last, count = schemes.catalog_state()
+    if last is None:
+        return None
+    # Filters and paging are part of the representation
+    raw = f"{last.isoformat()}:{count}:{request.GET.urlencode()}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _filtered_schemes(request):
+    # ?state= and ?category= filters shared by the catalog and search endpoints
+    qs = Scheme.objects.all()
+    state = request.GET.get("state")
+    if state:
+        # Central schemes apply in every state
+        qs = qs.filter(Q(state__iexact=state) | Q(state__iexact="All India"))
+    category = request.GET.get("category")
+    if category:
+        qs = qs.filter(category__iexact=category)
+    return qs
+
+
+@condition(etag_func=_schemes_etag, last_modified_func=_schemes_last_modified)
 @api_view(["GET"])
 def scrape_schemes(request):
-    url = "https://www.india.gov.in/topics/agriculture"
-    headers = {"User-Agent": "Mozilla/5.0"}  # helps avoid blocking
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    schemes = []
-    for idx, item in enumerate(soup.select(".views-row"), start=1):
-        # Title + Link
-        title_tag = item.select_one(".views-field-title a")
-        if not title_tag:   # skip if no title
-            continue
-
-        title = title_tag.get_text(strip=True)
-        link = "https://www.india.gov.in" + title_tag.get("href", "#")
-
-        # Description (optional)
-        desc_tag = item.select_one(".views-field-body p")
-        desc = desc_tag.get_text(strip=True) if desc_tag else "Description not available"
-
-        schemes.append({
-            "id": idx,
-            "title": title,
-            "shortDescription": desc[:150] + ("..." if len(desc) > 150 else ""),
-            "fullDescription": desc,
-            "officialLink": link,
-            "department": "Government of India",
-            "category": "Agriculture",
-            "state": "All India",
-            "eligibility": "Check official link for details",
-            "benefits": ["Details available on official site"],
-            "howToApply": "Visit official website",
-            "helpline": "N/A",
-            "email": "N/A",
-            "lastUpdated": datetime.now().strftime("%Y-%m-%d"),
-        })
+    # Served from the stored catalog (api/schemes.py); refreshed by
+    # `manage.py refresh_schemes` (cron, or `--every` as its own process).
+    # Optional ?state=, ?category=, ?page=&page_size=; the body stays a plain list
+    # for GovSchemes.jsx, with the unpaged total in X-Total-Count.
+    try:
+        schemes.ensure_catalog()
+    except Exception as e:
+        return Response({"error": f"Could not fetch schemes: {e}"}, status=502)
+
+    qs = _filtered_schemes(request)
+    total = qs.count()
+    if "page" in request.GET or "page_size" in request.GET:
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+            page_size = min(max(int(request.GET.get("page_size", 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "page and page_size must be integers"}, status=400)
+        qs = qs[(page - 1) * page_size:page * page_size]
+
+    response = Response([schemes.serialize(scheme) for scheme in qs])
+    response["X-Total-Count"] = str(total)
+    return response
 
-    return Response(schemes)
+@api_view(["GET"])
+def search_schemes(request):
+    # Ranked full-text search over the stored catalog (api/scheme_search.py):
+    # Postgres tsvector/GIN, or an in-process BM25 index on SQLite. Hindi and
+    # romanized farming words are expanded to their English equivalents.
+    query = (request.GET.get("q") or "").strip()
+    if not query:
+        return Response({"error": "Provide a search query as 'q'"}, status=400)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        page_size = min(max(int(request.GET.get("page_size", 20)), 1), 100)
+    except ValueError:
+        return Response({"error": "page and page_size must be integers"}, status=400)
+
+    qs = _filtered_schemes(request)
+    total, hits = scheme_search.search_schemes(query, qs, offset=(page - 1) * page_size, limit=page_size)
+    return Response({
+        "query": query,
+        "count": total,
+        "page": page,
+        "page_size": page_size,
+        "results": [{**schemes.serialize(scheme), "score": round(score, 4)} for scheme, score in hits],
+    })
 
 @api_view(["GET"])
 def download_profile_data(request):
@@ -637,13 +712,35 @@ def delete_account(request):
 
 @api_view(["POST"])
 def train_yield_model(request):
+    # Training runs as a background job in a separate process; poll the status
+    # URL for stage/progress. The new artifact is published atomically and
+    # serving workers hot-swap to it (api/ml/yield_model.py).
     try:
-        from .ml.yield_model import train_and_save
+        from .ml.yield_model import MODEL_PATH, train_and_save
+        from .ml.training import train_yield_in_subprocess
         force = bool(request.data.get('force', False)) if hasattr(request, 'data') else False
-        result = train_and_save(force=force)
-        return Response(result)
+        if MODEL_PATH.exists() and not force:
+            return Response(train_and_save(force=False))
+        job_id = yield_training_jobs.submit(train_yield_in_subprocess, force, progress=True)
+    except QueueFullError:
+        running = yield_training_jobs.running_job()
+        return Response({"error": "A training job is already running", "job_id": running,
+                         "status_url": f"/api/yield/train/jobs/{running}/" if running else None}, status=409)
     except Exception as e:
         return Response({"error": str(e)}, status=400)
+    return Response({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/yield/train/jobs/{job_id}/",
+    }, status=202)
+
+
+@api_view(["GET"])
+def yield_training_status(request, job_id):
+    job = yield_training_jobs.get(job_id)
+    if job is None:
+        return Response({"error": "Unknown or expired job"}, status=404)
+    return Response(job)
 
 @api_view(["POST"])
 def predict_yield_endpoint(request):
@@ -665,7 +762,7 @@ def predict_yield_endpoint(request):
         except Exception:
             return Response({"error": "Invalid data types for fields"}, status=400)
 
-        if area <= 0:
+        if not math.isfinite(area) or area <= 0:
             return Response({"error": "Area must be > 0"}, status=400)
 
         try:
@@ -673,17 +770,25 @@ def predict_yield_endpoint(request):
             result = predict_yield(crop=crop, season=season, year=year, area=area)
         except FileNotFoundError as fnf:
             return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
-        # attach a simple confidence proxy from model variance isn't available -> use heuristic
-        result.update({
-            'confidence': 90
-        })
         return Response(result)
     except Exception as e:
         return Response({"error": str(e)}, status=400)
 
 
-MODEL_ID = "wambugu71/crop_leaf_diseases_vit"
-HF_API_URL = f"https://api-inference.huggingface.co/models/{MODEL_ID}"
+@api_view(["POST"])
+def predict_yield_batch(request):
+    try:
+        payload = request.data if hasattr(request, 'data') else json.loads(request.body or "{}")
+        items = _batch_items(payload)
+        try:
+            from .ml.yield_model import predict_yield_batch
+            batch = predict_yield_batch(items)
+        except FileNotFoundError as fnf:
+            return Response({"error": str(fnf), "code": "MODEL_NOT_TRAINED"}, status=503)
+        return Response({"count": len(batch["results"]), **batch})
+    except Exception as e:
+        return Response({"error": str(e)}, status=400)
+
 
 # Simple knowledge base for UI output (kept brief + generic)
 DISEASE_INFO = {
@@ -746,6 +851,9 @@ DISEASE_INFO = {
 
 SEVERITY_COLOR = {"none": "emerald", "low": "sky", "medium": "amber", "high": "red"}
 
+# Disease results by image content (size-bounded "disease" cache, see settings.CACHES)
+_DISEASE_CACHE = PredictionCache("disease", alias_setting="DISEASE_CACHE_ALIAS", ttl_setting="DISEASE_CACHE_TTL")
+
 def _normalize_label(label: str) -> str:
     if not label:
         return "Unknown"
@@ -758,8 +866,7 @@ def _normalize_label(label: str) -> str:
 @csrf_exempt
 @require_POST
 def disease_detect(request):
-    hf_token = getattr(settings, "HF_API_TOKEN", None)
-    if not hf_token:
+    if disease_model.active_backend() == "remote" and not getattr(settings, "HF_API_TOKEN", None):
         return HttpResponseBadRequest("HF_API_TOKEN missing in server configuration.")
 
     file = request.FILES.get("image")
@@ -768,41 +875,91 @@ def disease_detect(request):
     if file.size > 10 * 1024 * 1024:  # 10 MB
         return HttpResponseBadRequest("Image too large. Max 10MB.")
 
-    image_bytes = file.read()
-    headers = {
-        "Authorization": f"Bearer {hf_token}",
-        "Accept": "application/json",
-        "Content-Type": "image/jpeg",   # <-- key fix!
-    }
-
-    response_json = None
-    last_status = None
-    for _ in range(3):
-        r = requests.post(HF_API_URL, headers=headers, data=image_bytes, timeout=60)
-        last_status = r.status_code
-        try:
-            response_json = r.json()
-        except Exception:
-            response_json = None
-
-        if r.status_code == 200 and isinstance(response_json, list):
-            break
-        if r.status_code == 503:
-            time.sleep(2)
-            continue
-        break
-
-
-
-    # Error handling
-    if not isinstance(response_json, list):
-        return JsonResponse(
-            {"error": "Inference failed",
-             "status_code": last_status,
-             "details": response_json},
-            status=502
-        )
-
+    # Decoded straight from the upload and downscaled to the model input size before
+    # local inference or the hosted API (api/ml/disease_model.py)
+    try:
+        image = disease_model.prepare(file)
+        if _wants_async(request):
+            # Answer right away; a background worker runs inference (api/jobs.py)
+            job_id = disease_jobs.submit(_detect_disease, image, on_error=_disease_error)
+            return JsonResponse({
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/api/disease-detect/jobs/{job_id}/",
+                "stream_url": f"/api/disease-detect/jobs/{job_id}/stream/",
+            }, status=202)
+        payload = _detect_disease(image)
+    except QueueFullError:
+        response = JsonResponse({"error": "Too many pending detections, retry shortly."}, status=503)
+        response["Retry-After"] = "5"
+        return response
+    except disease_model.InferenceError as e:
+        return JsonResponse(_disease_error(e), status=e.status)
+
+    return JsonResponse(payload)
+
+
+def _wants_async(request):
+    flag = request.POST.get("async") or request.GET.get("async") or ""
+    return flag.lower() in ("1", "true", "yes")
+
+
+def _detect_disease(image):
+    # Results are cached on the prepared pixels, so re-uploads and shared photos skip inference
+    return _DISEASE_CACHE.get_or_compute(
+        {"image": disease_model.image_key(image)},
+        disease_model.model_version(),
+        lambda: _disease_payload(disease_model.classify_image(image)),
+    )
+
+
+def _disease_error(e):
+    if not isinstance(e, disease_model.InferenceError):
+        return None
+    return {"error": str(e),
+            "status_code": e.upstream_status,
+            "details": e.details}
+
+
+@require_GET
+def disease_job_status(request, job_id):
+    job = disease_jobs.get(job_id)
+    if job is None:
+        return JsonResponse({"error": "Unknown or expired job"}, status=404)
+    return JsonResponse(job)
+
+
+@require_GET
+def disease_job_stream(request, job_id):
+    # Server-sent events: one event per status change, closing once the job is
+    # done or failed. Holds a worker thread while open, so prefer polling the
+    # status URL under sync gunicorn workers.
+    if disease_jobs.get(job_id) is None:
+        return JsonResponse({"error": "Unknown or expired job"}, status=404)
+
+    def events():
+        last = None
+        deadline = time.monotonic() + settings.DISEASE_JOB_STREAM_TIMEOUT
+        while time.monotonic() < deadline:
+            job = disease_jobs.get(job_id)
+            if job is None:
+                yield 'event: failed\ndata: {"error": "Unknown or expired job"}\n\n'
+                return
+            if job["status"] != last:
+                last = job["status"]
+                yield f"event: {last}\ndata: {json.dumps(job)}\n\n"
+            if last in disease_jobs.TERMINAL:
+                return
+            time.sleep(0.5)
+        yield "event: timeout\ndata: {}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
+
+
+def _disease_payload(response_json):
     # Pick top-1 and top-3
     predictions = sorted(response_json, key=lambda x: x.get("score", 0), reverse=True)
     top1 = predictions[0]
@@ -829,7 +986,7 @@ def disease_detect(request):
         "treatment": info["treatment"],
     }
 
-    return JsonResponse({
+    return {
         "result": result,
         "top_k": predictions[:3]
-    })
+    }
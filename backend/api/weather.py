@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .http_client import get_client
+
+
+class WeatherError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# In-flight upstream fetches per cache key, so concurrent misses share one request
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _location(city=None, lat=None, lon=None):
+    # Returns (cache key, OpenWeatherMap query params, ttl lookup name)
+    if lat not in (None, "") and lon not in (None, ""):
+        try:
+            lat, lon = round(float(lat), 2), round(float(lon), 2)  # ~1 km buckets
+        except (TypeError, ValueError):
+            raise WeatherError("Invalid lat/lon")
+        return f"weather:coords:{lat}:{lon}", {"lat": lat, "lon": lon}, None
+    name = " ".join(str(city or "").split()).lower()
+    if not name:
+        raise WeatherError("Provide a city or lat/lon")
+    return f"weather:city:{name}", {"q": name}, name
+
+
+def _ttl_for(name):
+    overrides = getattr(settings, "WEATHER_CITY_TTL", {})
+    return overrides.get(name, settings.WEATHER_CACHE_TTL)
+
+
+def _summarize(current_data, forecast_data):
+    # Group 3-hourly forecast entries into a daily summary
+    daily_forecast = {}
+    for entry in forecast_data["list"]:
+        # Convert timestamp → YYYY-MM-DD string
+        date_str = datetime.fromtimestamp(entry["dt"]).strftime("%Y-%m-%d")
+
+        if date_str not in daily_forecast:
+            daily_forecast[date_str] = {
+                "min": float(entry["main"]["temp_min"]),
+                "max": float(entry["main"]["temp_max"]),
+                "condition": entry["weather"][0]["description"].title(),
+                "icon": entry["weather"][0]["icon"],
+                "humidity": int(entry["main"]["humidity"]),
+                "windSpeed": float(entry["wind"]["speed"])
+            }
+        else:
+            daily_forecast[date_str]["min"] = min(daily_forecast[date_str]["min"], float(entry["main"]["temp_min"]))
+            daily_forecast[date_str]["max"] = max(daily_forecast[date_str]["max"], float(entry["main"]["temp_max"]))
+
+    # Take only 5 days
+    forecast_list = []
+    for date, info in list(daily_forecast.items())[:5]:
+        forecast_list.append({
+            "date": date,
+            **info
+        })
+
+    return {
+        "city": current_data.get("name"),
+        "current": {
+            "temp": float(current_data["main"]["temp"]),
+            "condition": current_data["weather"][0]["description"].title(),
+            "humidity": int(current_data["main"]["humidity"]),
+            "windSpeed": float(current_data["wind"]["speed"]),
+            "icon": current_data["weather"][0]["icon"]
+        },
+        "forecast": forecast_list
+    }
+
+
+# Current weather and forecast are fetched side by side
+_UPSTREAM_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="weather")
+
+
+def _get_json(url, query):
+    # Pooled keep-alive session with retries and a circuit breaker (api/http_client.py);
+    # the timeout comes from the "openweather" policy in settings.OUTBOUND_HTTP
+    return get_client("openweather").get(url, params=query).json()
+
+
+def _fetch_upstream(params):
+    base_url = settings.OPENWEATHER_BASE_URL
+    query = {**params, "appid": settings.OPENWEATHER_API_KEY, "units": "metric"}
+
+    # Wall time is max() of the two round-trips instead of their sum
+    current_future = _UPSTREAM_POOL.submit(_get_json, f"{base_url}/weather", query)
+    forecast_future = _UPSTREAM_POOL.submit(_get_json, f"{base_url}/forecast", query)
+    current_data = current_future.result()
+    forecast_data = forecast_future.result()
+
+    if "cod" in current_data and str(current_data["cod"]) != "200":
+        raise WeatherError(current_data.get("message", "Error fetching current weather"))
+    if "list" not in forecast_data:
+        raise WeatherError(forecast_data.get("message", "Error fetching forecast"))
+
+    return _summarize(current_data, forecast_data)
+
+
+def _refresh(key, params, ttl):
+    # Single-flight: the first caller fetches, later callers wait on its Future
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        data = _fetch_upstream(params)
+        entry = {"data": data, "fetched_at": time.time(), "ttl": ttl}
+        # Keep the entry past its TTL so it can be served stale while revalidating
+        cache.set(key, entry, timeout=ttl + settings.WEATHER_STALE_TTL)
+        future.set_result(data)
+        return data
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _refresh_in_background(key, params, ttl):
+    with _INFLIGHT_LOCK:
+        if key in _INFLIGHT:
+            return
+
+    def _run():
+        try:
+            _refresh(key, params, ttl)
+        except Exception:
+            pass  # keep serving the stale entry; the next request retries
+
+    threading.Thread(target=_run, daemon=True).start()
+
+
+def get_forecast(city=None, lat=None, lon=None):
+    key, params, name = _location(city, lat, lon)
+    ttl = _ttl_for(name)
+
+    entry = cache.get(key)
+    if entry is not None:
+        if time.time() - entry["fetched_at"] >= entry["ttl"]:
+            _refresh_in_background(key, params, ttl)
+        return entry["data"]
+
+    return _refresh(key, params, ttl)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Concurrent-load benchmark for micro-batched leaf disease inference.
+Fires --clients threads that each classify --requests prepared images, first
+straight through predict_local() one image at a time, then through the
+MicroBatcher (api/ml/batcher.py), and reports throughput and p50/p95 latency.
+Export the model first with `python manage.py export_disease_model` (or pass
+--model).
+
+Run from backend/:
+    python benchmarks/disease_batching.py --clients 16 --requests 8 --max-batch 8 --wait-ms 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from disease_inference import synthetic_jpegs  # noqa: E402
+
+
+def run(call, images, clients, requests):
+    def client(_):
+        latencies = []
+        for image in images[:requests]:
+            start = time.perf_counter()
+            call(image)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = [lat for lats in pool.map(client, range(clients)) for lat in lats]
+    wall = time.perf_counter() - start
+    return len(latencies) / wall, np.percentile(latencies, 50) * 1000, np.percentile(latencies, 95) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=8, help="Images per client")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=5)
+    parser.add_argument("--model", help="Path to an exported .onnx file (its .json must sit next to it)")
+    args = parser.parse_args()
+
+    from api.ml import disease_model
+    from api.ml.batcher import MicroBatcher
+
+    if args.model:
+        disease_model.ONNX_PATH = disease_model.Path(args.model)
+    if not disease_model.local_available():
+        sys.exit("Local model not available: install onnxruntime and run `manage.py export_disease_model`.")
+
+    disease_model.get_session()
+    size = disease_model.image_size()
+    images = [disease_model.prepare_image(b, size) for b in synthetic_jpegs(args.requests, size=(640, 480))]
+    print(f"{args.clients} clients x {args.requests} images, {os.cpu_count()} cores")
+
+    rate, p50, p95 = run(lambda image: disease_model.predict_local([image])[0], images, args.clients, args.requests)
+    print(f"one at a time       : {rate:7.1f} images/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms")
+
+    batcher = MicroBatcher(disease_model.predict_local, args.max_batch, args.wait_ms)
+    rate, p50, p95 = run(batcher.submit, images, args.clients, args.requests)
+    stats = batcher.stats()
+    print(f"micro-batched (<= {args.max_batch}): {rate:7.1f} images/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms"
+          f"  mean batch {stats['mean_batch']}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+CPU throughput benchmark for the local leaf disease classifier.
+Encodes synthetic phone-sized JPEGs and measures images per second through
+api.ml.disease_model for one-at-a-time and batched calls, including decode
+and preprocessing. Export the model first with
+`python manage.py export_disease_model` (or pass --model).
+
+Run from backend/:
+    python benchmarks/disease_inference.py --images 32 --batch 8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def synthetic_jpegs(count, size=(1600, 1200)):
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        pixels = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, format="JPEG", quality=85)
+        images.append(buf.getvalue())
+    return images
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--model", help="Path to an exported .onnx file (its .json must sit next to it)")
+    args = parser.parse_args()
+
+    from api.ml import disease_model
+
+    if args.model:
+        disease_model.ONNX_PATH = disease_model.Path(args.model)
+    if not disease_model.local_available():
+        sys.exit("Local model not available: install onnxruntime and run `manage.py export_disease_model`.")
+
+    images = synthetic_jpegs(args.images)
+    start = time.perf_counter()
+    disease_model.get_session()
+    print(f"session load + warm-up: {(time.perf_counter() - start) * 1000:.0f} ms, {os.cpu_count()} cores")
+
+    size = disease_model.image_size()
+    start = time.perf_counter()
+    for image in images:
+        disease_model.classify(image)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(images), args.batch):
+        disease_model.predict_local([disease_model.prepare_image(b, size) for b in images[i:i + args.batch]])
+    batched = time.perf_counter() - start
+
+    print(f"one at a time: {len(images) / single:7.1f} images/s ({single / len(images) * 1000:.1f} ms/image)")
+    print(f"batch of {args.batch:<4}: {len(images) / batched:7.1f} images/s ({batched / len(images) * 1000:.1f} ms/image)")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Parity check and latency benchmark for the flat-array forest engine.
+Compares CompiledForest.predict_proba against pipeline.predict_proba on the
+full training CSVs (exits non-zero on any mismatch), then times single-row
+and batch scoring for both engines.
+
+Run from backend/:
+    python benchmarks/forest_engine.py --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from api.ml import crop_model, fertilizer_model  # noqa: E402
+from api.ml.forest_engine import compile_pipeline  # noqa: E402
+
+
+def _time_ms(fn, X, repeat):
+    fn(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(X)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def check_and_time(name, module, repeat):
+    pipeline, meta = module.get_model()
+    engine = compile_pipeline(pipeline)
+    columns = meta["numeric_features"] + meta.get("categorical_features", [])
+    X = module._load_dataset()[columns]
+
+    diff = float(np.abs(pipeline.predict_proba(X) - engine.predict_proba(X)).max())
+    ok = diff <= 1e-12
+    print(f"\n{name}: {engine.n_trees} trees, {len(engine.feature)} nodes, depth {engine.max_depth}")
+    print(f"  parity on {len(X)} rows: max |diff| = {diff:.2e} {'OK' if ok else 'MISMATCH'}")
+
+    for label, rows in (("1 row", X.iloc[:1]), (f"{len(X)} rows", X)):
+        n = repeat if len(rows) == 1 else max(1, repeat // 10)
+        sk = _time_ms(pipeline.predict_proba, rows, n)
+        flat = _time_ms(engine.predict_proba, rows, n)
+        print(f"  {label:>10}: sklearn {sk:8.2f} ms   flat {flat:8.2f} ms   ({sk / flat:.1f}x)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = [
+        check_and_time("crop", crop_model, args.repeat),
+        check_and_time("fertilizer", fertilizer_model, args.repeat),
+    ]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Load test for the inference concurrency policy.
+Simulates W gunicorn workers (processes) each serving R single-row crop
+predictions back to back, once with the pickled n_jobs=-1 (every call fans
+out to all cores) and once with the online policy (n_jobs=1), and prints
+p50 / p99 / max latency across all workers.
+
+Run from backend/:
+    python benchmarks/inference_load.py --workers 4 --requests 100
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _worker(n_jobs, n_requests, barrier, results):
+    import pandas as pd
+    from joblib import parallel_config
+    from api.ml import crop_model
+    from api.ml.runtime import load_artifact
+
+    pipeline, _ = load_artifact(crop_model._get_cache_path())
+    pipeline.steps[-1][1].n_jobs = None
+    df = pd.DataFrame([crop_model._coerce_payload({"N": 90, "P": 42, "K": 43, "ph": 6.5})])
+
+    barrier.wait()
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        with parallel_config(n_jobs=n_jobs):
+            pipeline.predict_proba(df)
+        latencies.append((time.perf_counter() - start) * 1000)
+    results.put(latencies)
+
+
+def run(n_jobs, workers, n_requests):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(n_jobs, n_requests, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    latencies = np.concatenate([results.get() for _ in procs])
+    for p in procs:
+        p.join()
+    return np.percentile(latencies, [50, 99]).tolist() + [float(latencies.max())]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.requests} single-row requests on {os.cpu_count()} cores (ms)")
+    print(f"{'policy':<22}{'p50':>10}{'p99':>10}{'max':>10}")
+    for label, n_jobs in (("n_jobs=-1 (pickled)", -1), ("n_jobs=1 (online)", 1)):
+        p50, p99, worst = run(n_jobs, args.workers, args.requests)
+        print(f"{label:<22}{p50:>10.1f}{p99:>10.1f}{worst:>10.1f}")
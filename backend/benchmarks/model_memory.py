@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Per-worker memory benchmark for the model artifacts.
+Starts N worker processes that each load the crop and fertilizer artifacts,
+run one prediction (so the tree pages are actually touched) and report
+RSS / USS / PSS while all workers are alive, with and without mmap loading.
+
+Run from backend/ after `python manage.py warm_models`:
+    python benchmarks/model_memory.py --workers 4
+Requires psutil (pip install psutil); PSS is only reported on Linux.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _worker(mmap, barrier, results):
+    import psutil
+    import pandas as pd
+    from api.ml import crop_model, fertilizer_model
+    from api.ml.runtime import load_artifact
+
+    proc = psutil.Process()
+    before = proc.memory_full_info()
+
+    crop_pipeline, _ = load_artifact(crop_model._get_cache_path(), mmap=mmap)
+    fert_pipeline, _ = load_artifact(fertilizer_model._get_cache_path(), mmap=mmap)
+    crop_pipeline.predict_proba(pd.DataFrame([crop_model._coerce_payload({})]))
+    fert_pipeline.predict_proba(pd.DataFrame([fertilizer_model._coerce_payload({})]))
+
+    # Measure once every worker has its models resident, so PSS splits shared pages
+    barrier.wait()
+    after = proc.memory_full_info()
+    results.put({
+        "rss": after.rss - before.rss,
+        "uss": after.uss - before.uss,
+        "pss": getattr(after, "pss", 0) - getattr(before, "pss", 0),
+    })
+    barrier.wait()
+
+
+def run(mmap, workers):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mmap, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    samples = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return {k: sum(s[k] for s in samples) / len(samples) / 1e6 for k in samples[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Per-worker memory growth after loading models ({args.workers} workers, MB)")
+    print(f"{'mode':<10}{'RSS':>10}{'USS':>10}{'PSS':>10}")
+    for label, mmap in (("in-heap", False), ("mmap", True)):
+        stats = run(mmap, args.workers)
+        print(f"{label:<10}{stats['rss']:>10.1f}{stats['uss']:>10.1f}{stats['pss']:>10.1f}")
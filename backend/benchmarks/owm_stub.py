@@ -0,0 +1,77 @@
+"""
+Local stand-in for the OpenWeatherMap /weather and /forecast endpoints.
+Serves canned JSON with an injected per-request latency and counts hits,
+so the weather view can be exercised without a network or an API key.
+Point OPENWEATHER_BASE_URL at `server.url` to use it.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _current(name):
+    return {
+        "cod": 200,
+        "name": name,
+        "main": {"temp": 31.5, "humidity": 70},
+        "weather": [{"description": "scattered clouds", "icon": "03d"}],
+        "wind": {"speed": 3.2},
+    }
+
+
+def _forecast():
+    start = int(time.time())
+    return {
+        "cod": "200",
+        "list": [
+            {
+                "dt": start + i * 3 * 3600,
+                "main": {"temp_min": 26.0 + i % 4, "temp_max": 33.0 + i % 3, "humidity": 65},
+                "weather": [{"description": "light rain", "icon": "10d"}],
+                "wind": {"speed": 4.1},
+            }
+            for i in range(40)
+        ],
+    }
+
+
+class StubServer:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.hits = Counter()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                endpoint = parsed.path.rsplit("/", 1)[-1]
+                stub.hits[endpoint] += 1
+                time.sleep(stub.latency)
+                name = parse_qs(parsed.query).get("q", ["Coordinates"])[0].title()
+                body = json.dumps(_current(name) if endpoint == "weather" else _forecast()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/data/2.5"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
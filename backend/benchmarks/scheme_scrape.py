@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Exercises the incremental scheme scraper against saved HTML fixtures.
+Serves benchmarks/fixtures/schemes/ from a local stub with ETag support and
+runs four refreshes into a throwaway SQLite database: cold, unchanged
+(every page should answer 304), one edited row (only that row is upserted),
+and a server without validators (identical bodies are skipped by hash).
+
+Run from backend/:
+    python benchmarks/scheme_scrape.py --latency 0.2
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kisan_saarthi.settings")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Never write fixture schemes into the configured database
+WORK_DIR = tempfile.mkdtemp(prefix="scheme-scrape-")
+settings.DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(WORK_DIR, "db.sqlite3")}
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from api.models import Scheme  # noqa: E402
+from api.schemes import refresh_schemes  # noqa: E402
+from schemes_stub import FIXTURE_DIR, StubServer  # noqa: E402
+
+
+def run(label, stub):
+    stub.hits.clear()
+    stub.not_modified.clear()
+    start = time.perf_counter()
+    stats = refresh_schemes()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed * 1000:7.0f} ms  200s {sum(stub.hits.values())}  304s "
+          f"{sum(stub.not_modified.values())}  {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Injected per-page latency in seconds")
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    pages = os.path.join(WORK_DIR, "pages")
+    shutil.copytree(FIXTURE_DIR, pages)
+
+    try:
+        with StubServer(pages, latency=args.latency) as stub:
+            settings.SCHEMES_SOURCE_URL = stub.url
+            run("cold", stub)
+            run("unchanged", stub)
+
+            path = os.path.join(pages, "page1.html")
+            with open(path) as fh:
+                html = fh.read()
+            with open(path, "w") as fh:
+                fh.write(html.replace("Solar pumps", "Solar water pumps"))
+            run("one row edit", stub)
+
+            stub.validators = False
+            run("no validators", stub)
+            print(f"catalog: {Scheme.objects.count()} schemes; PM-KUSUM: "
+                  f"{Scheme.objects.get(title='PM-KUSUM').description!r}")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
@@ -0,0 +1,78 @@
+"""
+Local stand-in for the india.gov.in agriculture scheme listing.
+Serves the saved pages in benchmarks/fixtures/schemes/ (page0.html for the
+first page, pageN.html for ?page=N) with an ETag and Last-Modified taken from
+each file, answers conditional requests with 304, and counts full and
+not-modified responses per page. Point SCHEMES_SOURCE_URL at `server.url`.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "schemes")
+
+
+class StubServer:
+    def __init__(self, fixture_dir=FIXTURE_DIR, latency=0.0, validators=True):
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.validators = validators  # False mimics a server that never sends 304s
+        self.hits = Counter()
+        self.not_modified = Counter()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                page = parse_qs(parsed.query).get("page", ["0"])[0]
+                path = os.path.join(stub.fixture_dir, f"page{page}.html")
+                time.sleep(stub.latency)
+                if parsed.path != "/topics/agriculture" or not os.path.exists(path):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                with open(path, "rb") as fh:
+                    body = fh.read()
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                last_modified = formatdate(os.path.getmtime(path), usegmt=True)
+                if stub.validators and self.headers.get("If-None-Match") == etag:
+                    stub.not_modified[page] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                stub.hits[page] += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if stub.validators:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/topics/agriculture"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Exercises the weather cache against a local OpenWeatherMap stub.
+Fires N concurrent requests for one city on a cold cache and reports how many
+upstream calls were made (single-flight should make exactly one of each),
+then expires the entry and shows a stale response served instantly while a
+single background refresh runs.
+
+Run from backend/:
+    python benchmarks/weather_cache.py --clients 50 --latency 0.3
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kisan_saarthi.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from api.weather import get_forecast  # noqa: E402
+from owm_stub import StubServer  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.3, help="Injected upstream latency in seconds")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        settings.OPENWEATHER_BASE_URL = stub.url
+        settings.OPENWEATHER_API_KEY = settings.OPENWEATHER_API_KEY or "stub"
+        cache.clear()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            list(pool.map(lambda _: get_forecast(city="Lucknow"), range(args.clients)))
+        elapsed = time.perf_counter() - start
+        print(f"cold: {args.clients} concurrent requests in {elapsed:.2f}s, upstream hits {dict(stub.hits)}")
+
+        start = time.perf_counter()
+        get_forecast(city="  LUCKNOW ")
+        print(f"warm: {(time.perf_counter() - start) * 1000:.2f} ms, upstream hits {dict(stub.hits)}")
+
+        # Age the entry past its TTL: served stale immediately, refreshed once in the background
+        key = "weather:city:lucknow"
+        entry = cache.get(key)
+        entry["fetched_at"] -= entry["ttl"]
+        cache.set(key, entry)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            list(pool.map(lambda _: get_forecast(city="Lucknow"), range(args.clients)))
+        print(f"stale: {args.clients} requests in {(time.perf_counter() - start) * 1000:.1f} ms")
+        time.sleep(args.latency * 3)
+        print(f"after revalidation: upstream hits {dict(stub.hits)}")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Wall-clock benchmark for the weather upstream fetch.
+Serves /weather and /forecast from a local stub with injected latency and
+compares the old sequential pattern (two bare requests.get calls, a new
+connection each) with api.weather._fetch_upstream (both calls in parallel on
+pooled keep-alive connections). The cache is bypassed.
+
+Run from backend/:
+    python benchmarks/weather_latency.py --latency 0.2 --repeat 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kisan_saarthi.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from api.weather import _fetch_upstream  # noqa: E402
+from owm_stub import StubServer  # noqa: E402
+
+
+def sequential(base_url):
+    query = {"q": "lucknow", "appid": "stub", "units": "metric"}
+    requests.get(f"{base_url}/weather", params=query, timeout=10).json()
+    requests.get(f"{base_url}/forecast", params=query, timeout=10).json()
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Injected upstream latency in seconds")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        settings.OPENWEATHER_BASE_URL = stub.url
+        settings.OPENWEATHER_API_KEY = "stub"
+        seq = _median_ms(lambda: sequential(stub.url), args.repeat)
+        par = _median_ms(lambda: _fetch_upstream({"q": "lucknow"}), args.repeat)
+
+    print(f"upstream latency {args.latency * 1000:.0f} ms per call, median of {args.repeat}")
+    print(f"  sequential, new connections: {seq:8.1f} ms")
+    print(f"  parallel, pooled session:    {par:8.1f} ms")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Compare the yield model backends: RandomForest vs histogram gradient boosting.
+Holds out --holdout of the cleaned dataset, fits _build_pipeline('forest') on a
+MAX_TRAINING_ROWS sample of the rest (what training does today) and
+_build_pipeline('hgb') on all of it, then reports fit time, artifact size,
+single-row / batch predict latency and hold-out error. Uses a synthetic
+crop_production-shaped CSV unless --csv is given.
+
+Run from backend/:
+    python benchmarks/yield_backends.py --rows 250000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from yield_ingest import synthetic_crop_production  # noqa: E402
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def evaluate(name, pipeline, train, test, features, target, tmp):
+    from api.ml.runtime import apply_inference_policy, dump_atomic, inference_jobs
+
+    start = time.perf_counter()
+    pipeline.fit(train[features], train[target])
+    fit_s = time.perf_counter() - start
+
+    path = os.path.join(tmp, f'{name}.joblib')
+    dump_atomic(pipeline, path)
+    size_mb = os.path.getsize(path) / 1e6
+
+    apply_inference_policy(pipeline)
+    one = test[features].iloc[:1]
+    with inference_jobs():
+        single_ms = _median_ms(lambda: pipeline.predict(one), 50)
+    with inference_jobs(batch=True):
+        batch_ms = _median_ms(lambda: pipeline.predict(test[features]), 3)
+        predicted = pipeline.predict(test[features])
+
+    error = predicted - test[target].to_numpy()
+    mae = np.abs(error).mean()
+    rmse = np.sqrt((error ** 2).mean())
+    r2 = 1 - (error ** 2).sum() / ((test[target] - test[target].mean()) ** 2).sum()
+    print(f"{name:<7} {len(train):>8} {fit_s:7.2f} s {size_mb:8.1f} MB {single_ms:7.2f} ms"
+          f" {batch_ms:8.0f} ms  MAE {mae:7.3f}  RMSE {rmse:7.3f}  R2 {r2:6.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=250000, help="Rows in the synthetic CSV")
+    parser.add_argument("--csv", help="Use this crop_production CSV instead of a synthetic one")
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fraction of cleaned rows held out")
+    args = parser.parse_args()
+
+    from api.ml import yield_model
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv or synthetic_crop_production(os.path.join(tmp, 'crop_production.csv'), args.rows)
+        df = yield_model.load_training_data(path, max_rows=None)
+        holdout = np.random.default_rng(0).random(len(df)) < args.holdout
+        train, test = df[~holdout].reset_index(drop=True), df[holdout].reset_index(drop=True)
+        features = [*yield_model.CATEGORICAL_FEATURES, *yield_model.NUMERIC_FEATURES]
+        target = yield_model.TARGET_COLUMN
+        print(f"{len(df)} cleaned rows, {len(test)} held out, {os.cpu_count()} cores")
+        print(f"backend {'rows':>8} {'fit':>9} {'artifact':>11} {'1 row':>10} {f'{len(test)} rows':>11}")
+
+        forest_train = yield_model._reservoir_sample([train], yield_model.MAX_TRAINING_ROWS)
+        evaluate('forest', yield_model._build_pipeline('forest'), forest_train, test, features, target, tmp)
+        evaluate('hgb', yield_model._build_pipeline('hgb'), train, test, features, target, tmp)
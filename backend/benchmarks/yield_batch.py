@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Village-scale yield planning: one request per plot vs one batch request.
+Builds --plots plots over a handful of crops/seasons and times --plots calls
+to the single-plot view (POST /api/yield/predict/) against one call to the
+batch view (POST /api/yield/predict/batch/), both in-process through DRF's
+request factory, so no network time is included; each avoided round-trip
+also saves one client-server RTT. Fits a forest on a synthetic
+crop_production-shaped CSV unless --model points at an artifact.
+
+Run from backend/:
+    python benchmarks/yield_batch.py --plots 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kisan_saarthi.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api import views  # noqa: E402
+from api.ml import yield_model  # noqa: E402
+from yield_ingest import synthetic_crop_production  # noqa: E402
+
+
+def village_plots(count, seed=0):
+    rng = np.random.default_rng(seed)
+    crops = ['Rice', 'Wheat', 'Maize', 'Groundnut', 'Potato', 'Onion', 'Bajra', 'Jowar']
+    return [
+        {'cropName': str(crop), 'season': str(season), 'year': 2014, 'area': float(area)}
+        for crop, season, area in zip(
+            rng.choice(crops, count), rng.choice(['Kharif', 'Rabi'], count), rng.uniform(0.2, 5, count).round(2)
+        )
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--plots", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=30000, help="Rows in the synthetic CSV")
+    parser.add_argument("--model", help="Path to a trained yield_model.joblib")
+    args = parser.parse_args()
+
+    factory = APIRequestFactory()
+    with tempfile.TemporaryDirectory() as tmp:
+        yield_model.MODEL_PATH = Path(args.model or os.path.join(tmp, 'yield_model.joblib'))
+        yield_model._REGISTRY.path = yield_model.MODEL_PATH
+        if not args.model:
+            yield_model.DATA_PATH = Path(synthetic_crop_production(os.path.join(tmp, 'crop_production.csv'), args.rows))
+            yield_model.DATASET_CACHE_DIR = Path(tmp) / 'cache'
+            yield_model.train_and_save(force=True)
+
+        plots = village_plots(args.plots)
+        keys = {(p['cropName'], p['season'], p['year']) for p in plots}
+        print(f"{len(plots)} plots, {len(keys)} distinct crop/season/year keys")
+        yield_model.predict_yield_batch(plots[:1])
+
+        start = time.perf_counter()
+        singles = [
+            views.predict_yield_endpoint(factory.post('/api/yield/predict/', plot, format='json')).data
+            for plot in plots
+        ]
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = views.predict_yield_batch(factory.post('/api/yield/predict/batch/', {'items': plots}, format='json'))
+        batched = time.perf_counter() - start
+
+        assert response.status_code == 200, response.data
+        assert singles == response.data['results']
+        print(f"{len(plots)} single requests : {one_by_one * 1000:8.1f} ms  (+ {len(plots)} network round-trips)")
+        print(f"1 batch request     : {batched * 1000:8.1f} ms  ({len(response.data['groups'])} crop/season groups)")
+        print(f"totals: {response.data['totals']}")
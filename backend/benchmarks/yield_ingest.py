@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Time and peak-memory benchmark for the yield training dataset ingest.
+Compares the old path (pd.read_csv with default dtypes, whole-frame cleaning,
+then df.sample) with the chunked narrow-dtype stream in api/ml/yield_model.py,
+cold and again from the Parquet cache (when pyarrow is installed). Uses a
+synthetic crop_production-shaped CSV unless --csv is given.
+
+Run from backend/:
+    python benchmarks/yield_ingest.py --rows 250000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+CROPS = {
+    'Rice': 2.5, 'Wheat': 3.0, 'Maize': 2.8, 'Cotton(lint)': 0.5, 'Sugarcane': 70.0, 'Arhar/Tur': 0.8,
+    'Moong(Green Gram)': 0.6, 'Groundnut': 1.2, 'Jowar': 1.0, 'Bajra': 1.1, 'Potato': 20.0, 'Onion': 15.0,
+}
+# Padded like the published file
+SEASONS = ['Kharif     ', 'Rabi       ', 'Whole Year ', 'Summer     ', 'Autumn     ', 'Winter     ']
+
+
+def synthetic_crop_production(path, rows, seed=0):
+    # Same columns as data/crop_production.csv, with ~1% missing production
+    rng = np.random.default_rng(seed)
+    crops = rng.choice(list(CROPS), rows)
+    years = rng.integers(1997, 2015, rows)
+    area = rng.lognormal(6, 1.5, rows).round(1)
+    yields = np.array([CROPS[c] for c in crops]) * (1 + 0.02 * (years - 1997)) * rng.lognormal(0, 0.3, rows)
+    df = pd.DataFrame({
+        'State_Name': rng.choice(['Punjab', 'Bihar', 'Kerala', 'Maharashtra'], rows),
+        'District_Name': rng.choice([f'District {i}' for i in range(40)], rows),
+        'Crop_Year': years,
+        'Season': rng.choice(SEASONS, rows),
+        'Crop': crops,
+        'Area': area,
+        'Production': (area * yields).round(2),
+    })
+    df.loc[rng.random(rows) < 0.01, 'Production'] = np.nan
+    df.to_csv(path, index=False)
+    return path
+
+
+def legacy_load(path, max_rows):
+    # The pre-streaming ingest, kept here for comparison
+    df = pd.read_csv(path)
+    df.columns = [c.strip().lower().replace(' ', '_') for c in df.columns]
+    df = df.rename(columns={'crop_year': 'year'})
+    df = df[['production', 'area', 'crop', 'season', 'year']].copy().dropna()
+    df = df[(df['area'] > 0) & (df['production'] >= 0)]
+    df['yield_per_ha'] = df['production'] / df['area']
+    low, high = df['yield_per_ha'].quantile([0.01, 0.99])
+    df = df[(df['yield_per_ha'] >= low) & (df['yield_per_ha'] <= high)]
+    df['crop'] = df['crop'].astype(str).str.strip().str.lower()
+    df['season'] = df['season'].astype(str).str.strip().str.title()
+    df['year'] = df['year'].astype(int)
+    df = df[['crop', 'season', 'year', 'yield_per_ha']].reset_index(drop=True)
+    if len(df) > max_rows:
+        df = df.sample(n=max_rows, random_state=42).reset_index(drop=True)
+    return df
+
+
+def measure(label, fn, reset=lambda: None):
+    # Timed untraced, then run again under tracemalloc for the peak
+    reset()
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+    reset()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22}: {elapsed * 1000:8.0f} ms  peak {peak / 1e6:7.1f} MB  {len(df)} rows")
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=250000, help="Rows in the synthetic CSV")
+    parser.add_argument("--csv", help="Use this crop_production CSV instead of a synthetic one")
+    parser.add_argument("--max-rows", type=int, default=80000)
+    args = parser.parse_args()
+
+    from api.ml import yield_model
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv or synthetic_crop_production(os.path.join(tmp, 'crop_production.csv'), args.rows)
+        yield_model.DATASET_CACHE_DIR = Path(tmp) / 'cache'
+
+        def clear_cache():
+            shutil.rmtree(yield_model.DATASET_CACHE_DIR, ignore_errors=True)
+
+        print(f"{path}: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        old = measure("read_csv + sample", lambda: legacy_load(path, args.max_rows))
+        new = measure("chunked stream", lambda: yield_model.load_training_data(path, args.max_rows), clear_cache)
+        if yield_model.PARQUET_AVAILABLE:
+            measure("parquet cache", lambda: yield_model.load_training_data(path, args.max_rows))
+        else:
+            print("parquet cache         : skipped (pyarrow not installed)")
+
+        # Different samples of the same data: the target distribution should agree
+        for name, df in (("read_csv", old), ("stream", new)):
+            q = df['yield_per_ha'].quantile([0.1, 0.5, 0.9]).round(3).tolist()
+            print(f"{name:<9} yield p10/p50/p90 {q}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Cost of yield prediction intervals from the forest's per-tree outputs.
+Scores --batch random plots four ways: the plain sklearn predict (point only),
+a Python loop over estimators_ stacking per-tree predictions, the single
+apply() + gather pass used by api/ml/yield_model.py, and
+predict_yield_batch() served from the precomputed table. Fits a forest on a
+synthetic crop_production-shaped CSV unless --model points at an artifact.
+
+Run from backend/:
+    python benchmarks/yield_intervals.py --rows 30000 --batch 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from yield_ingest import synthetic_crop_production  # noqa: E402
+
+
+def _best_ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def loop_over_trees(pipeline, X, quantiles):
+    Xt = pipeline.named_steps['preprocess'].transform(X)
+    per_tree = np.stack([tree.predict(Xt) for tree in pipeline.named_steps['regressor'].estimators_], axis=1)
+    return per_tree.mean(axis=1), np.quantile(per_tree, quantiles, axis=1).T
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=30000, help="Rows in the synthetic CSV")
+    parser.add_argument("--batch", type=int, default=5000, help="Plots scored per call")
+    parser.add_argument("--model", help="Path to a trained forest yield_model.joblib")
+    args = parser.parse_args()
+
+    from api.ml import yield_model
+    from api.ml.runtime import inference_jobs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        yield_model.MODEL_PATH = Path(args.model or os.path.join(tmp, 'yield_model.joblib'))
+        yield_model._REGISTRY.path = yield_model.MODEL_PATH
+        if not args.model:
+            yield_model.DATA_PATH = Path(synthetic_crop_production(os.path.join(tmp, 'crop_production.csv'), args.rows))
+            yield_model.DATASET_CACHE_DIR = Path(tmp) / 'cache'
+            start = time.perf_counter()
+            yield_model.train_and_save(force=True)
+            print(f"trained in {time.perf_counter() - start:.1f} s")
+
+        bundle = yield_model._get_bundle()
+        pipeline, table = bundle['pipeline'], bundle['table']
+        if not yield_model._is_forest(pipeline):
+            sys.exit("Per-tree intervals need the forest backend (YIELD_MODEL_BACKEND=forest).")
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({
+            'crop': rng.choice(table['crops'], args.batch),
+            'season': rng.choice(table['seasons'], args.batch),
+            'year': rng.integers(1997, 2015, args.batch),
+        })
+        quantiles = yield_model._interval_quantiles(table['coverage'])
+        print(f"{args.batch} plots, {len(pipeline.named_steps['regressor'].estimators_)} trees, {os.cpu_count()} cores")
+
+        with inference_jobs(batch=True):
+            ms, point = _best_ms(lambda: pipeline.predict(X))
+        print(f"sklearn predict (point only)  : {ms:8.1f} ms")
+
+        ms, (mean, bounds) = _best_ms(lambda: loop_over_trees(pipeline, X, quantiles))
+        print(f"loop over estimators_         : {ms:8.1f} ms")
+
+        leaf_values = yield_model._leaf_values(pipeline.named_steps['regressor'])
+        ms, stats = _best_ms(lambda: yield_model._score_rows(pipeline, X, table['coverage'], leaf_values))
+        print(f"apply() + one gather          : {ms:8.1f} ms")
+
+        items = [{'crop': c, 'season': s, 'year': int(y), 'area': 1.0} for c, s, y in X.itertuples(index=False)]
+        ms, _ = _best_ms(lambda: yield_model.predict_yield_batch(items))
+        print(f"predict_yield_batch (table)   : {ms:8.1f} ms")
+
+        print(f"max |mean - sklearn| {np.abs(stats[:, 0] - point).max():.2e}"
+              f"  max |interval - loop| {np.abs(stats[:, 1:3] - bounds).max():.2e}")
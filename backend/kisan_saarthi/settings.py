@@ -32,6 +32,30 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 
 
 HF_API_TOKEN = os.getenv("HF_API_TOKEN") 
+
+# Outbound HTTP clients (api/http_client.py): pooled keep-alive sessions with
+# timeout, retry/backoff and a per-host circuit breaker. Unset keys use DEFAULT_POLICY.
+OUTBOUND_HTTP = {
+    "httpsms": {"timeout": 10, "retries": 2, "retry_methods": ["GET"]},  # never resend an SMS
+    "openweather": {"timeout": 10, "retries": 2},
+    "india_gov": {"timeout": (5, 20), "retries": 2},
+    # Model cold starts answer 503; retry the POST with exponential backoff. Worst
+    # case 4 attempts x 35 s + 0/4/8 s of backoff = 152 s, so no Retry-After sleeps
+    "huggingface": {
+        "timeout": (5, 30), "retries": 3, "backoff": 2, "retry_statuses": [503], "retry_methods": ["POST"],
+        "respect_retry_after": False,
+    },
+}
+
+# OpenWeatherMap; the base URL can point at a local mock server for testing
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+# Daily summaries are fresh for WEATHER_CACHE_TTL seconds, then served stale for up
+# to WEATHER_STALE_TTL more while one background request revalidates them
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_STALE_TTL = int(os.getenv("WEATHER_STALE_TTL", "3600"))
+# Per-city overrides of WEATHER_CACHE_TTL, keyed by lower-case city name
+WEATHER_CITY_TTL = {}
 # SECURITY WARNING: don't run with debug turned on in production!
 # DEBUG = True
 
@@ -112,6 +136,39 @@ DATABASES = {
 }
 
 
+# Cache
+# Per-process locmem by default; set REDIS_URL to share entries across workers (needs redis-py).
+# Required with more than one worker process: background job state lives here (api/jobs.py).
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        },
+        # Size is bounded by the Redis maxmemory eviction policy
+        'disease': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'disease',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'kisan-saarthi',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        # Separate LRU store so photo results don't evict weather/ML entries
+        'disease': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'kisan-saarthi-disease',
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DISEASE_CACHE_MAX_ENTRIES', '2000'))},
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -195,8 +252,83 @@ SIMPLE_JWT = {
 }
 
 CORS_ALLOW_HEADERS = list(default_headers) + ["withcredentials"]
+# Lets the frontend read the unpaged scheme total (GovSchemes.jsx paging)
+CORS_EXPOSE_HEADERS = ["X-Total-Count"]
 
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
-]
\ No newline at end of file
+]
+
+# ML model serving
+# Load all models when the WSGI app is imported (serving only); run gunicorn with --preload so workers share them
+ML_PRELOAD_MODELS = os.getenv('ML_PRELOAD_MODELS') == 'True'
+# Let a request train a missing artifact (dev only); otherwise run `manage.py warm_models`
+ML_TRAIN_ON_REQUEST = os.getenv('ML_TRAIN_ON_REQUEST', str(DEBUG)) == 'True'
+# Seconds between checks for a replaced yield artifact (hot reload without restarts)
+ML_RELOAD_CHECK_INTERVAL = float(os.getenv('ML_RELOAD_CHECK_INTERVAL', '2'))
+# Yield lookup table: every crop x season over these years is precomputed after
+# training (default: training years + YIELD_TABLE_YEARS_AHEAD); others use the forest
+YIELD_TABLE_FIRST_YEAR = int(os.getenv('YIELD_TABLE_FIRST_YEAR')) if os.getenv('YIELD_TABLE_FIRST_YEAR') else None
+YIELD_TABLE_LAST_YEAR = int(os.getenv('YIELD_TABLE_LAST_YEAR')) if os.getenv('YIELD_TABLE_LAST_YEAR') else None
+YIELD_TABLE_YEARS_AHEAD = int(os.getenv('YIELD_TABLE_YEARS_AHEAD', '10'))
+# Yield estimator: "forest" (RandomForest on an 80k-row sample) or "hgb" (histogram
+# gradient boosting with native categorical splits, trained on every row). Takes
+# effect on the next training run.
+YIELD_MODEL_BACKEND = os.getenv('YIELD_MODEL_BACKEND', 'forest')
+# Rows per chunk when streaming crop_production.csv into the yield training set
+YIELD_INGEST_CHUNK_ROWS = int(os.getenv('YIELD_INGEST_CHUNK_ROWS', '100000'))
+# Share of the forest's per-tree yield predictions inside yieldLow..yieldHigh
+YIELD_INTERVAL_COVERAGE = float(os.getenv('YIELD_INTERVAL_COVERAGE', '0.8'))
+# How long background yield training job state (and its single-run lock) is kept
+YIELD_TRAINING_JOB_TTL = int(os.getenv('YIELD_TRAINING_JOB_TTL', '7200'))
+# Memory-map uncompressed joblib artifacts so workers on one host share their numpy arrays
+# (not the forests' tree nodes, which sklearn copies on load)
+ML_ARTIFACT_MMAP = os.getenv('ML_ARTIFACT_MMAP') == 'True'
+# "flat" evaluates the forests with the vectorized engine in api/ml/forest_engine.py
+ML_INFERENCE_ENGINE = os.getenv('ML_INFERENCE_ENGINE', 'sklearn')
+# Forest inference threads: 1 for online requests so gunicorn workers don't
+# oversubscribe cores, all cores (-1) for batch endpoints and offline scoring
+ML_ONLINE_N_JOBS = int(os.getenv('ML_ONLINE_N_JOBS', '1'))
+ML_BATCH_N_JOBS = int(os.getenv('ML_BATCH_N_JOBS', '-1'))
+# Crop/fertilizer prediction cache: TTL in seconds (0 disables), optional rounding
+# of the coerced features to N decimals so near-identical readings share an entry
+ML_PREDICTION_CACHE_ALIAS = 'default'
+ML_PREDICTION_CACHE_TTL = int(os.getenv('ML_PREDICTION_CACHE_TTL', '3600'))
+ML_PREDICTION_CACHE_ROUNDING = int(os.getenv('ML_PREDICTION_CACHE_ROUNDING')) if os.getenv('ML_PREDICTION_CACHE_ROUNDING') else None
+
+# Leaf disease classifier: "local" runs the ONNX export from `manage.py export_disease_model`
+# in-process (needs onnxruntime), "remote" calls the HF inference API, "auto" prefers local
+DISEASE_BACKEND = os.getenv('DISEASE_BACKEND', 'auto')
+DISEASE_ONNX_PATH = os.getenv('DISEASE_ONNX_PATH') or None
+# ONNX Runtime intra-op threads per process (0 lets the runtime decide)
+DISEASE_ONNX_THREADS = int(os.getenv('DISEASE_ONNX_THREADS', '0'))
+# Micro-batching of concurrent local inferences: max images per forward pass
+# (1 disables) and how long the first image waits for others to arrive.
+# Measure with benchmarks/disease_batching.py before enabling on a host.
+DISEASE_BATCH_MAX_SIZE = int(os.getenv('DISEASE_BATCH_MAX_SIZE', '1'))
+DISEASE_BATCH_MAX_WAIT_MS = float(os.getenv('DISEASE_BATCH_MAX_WAIT_MS', '2'))
+# Uploads are center-cropped and resized to this square before going to the hosted API
+DISEASE_IMAGE_SIZE = int(os.getenv('DISEASE_IMAGE_SIZE', '224'))
+# Disease result cache: TTL in seconds (0 disables); perceptual (dHash) keys also
+# match re-compressed copies of a photo, at the risk of merging near-identical shots
+DISEASE_CACHE_ALIAS = 'disease'
+DISEASE_CACHE_TTL = int(os.getenv('DISEASE_CACHE_TTL', '86400'))
+DISEASE_CACHE_PERCEPTUAL = os.getenv('DISEASE_CACHE_PERCEPTUAL') == 'True'
+# Max differing bits (of 64) for two photos to count as the same in perceptual mode
+DISEASE_CACHE_PERCEPTUAL_DISTANCE = int(os.getenv('DISEASE_CACHE_PERCEPTUAL_DISTANCE', '4'))
+
+# Async disease detection (POST /api/disease-detect/ with async=1): concurrent
+# inferences per process, queue bound before answering 503, job state lifetime
+DISEASE_JOB_WORKERS = int(os.getenv('DISEASE_JOB_WORKERS', '2'))
+DISEASE_JOB_MAX_PENDING = int(os.getenv('DISEASE_JOB_MAX_PENDING', '100'))
+DISEASE_JOB_TTL = int(os.getenv('DISEASE_JOB_TTL', '3600'))
+DISEASE_JOB_STREAM_TIMEOUT = int(os.getenv('DISEASE_JOB_STREAM_TIMEOUT', '120'))
+
+# Government scheme catalog (api/schemes.py), refreshed by `manage.py refresh_schemes`;
+# whether a request on an empty catalog may scrape once to fill it
+SCHEMES_BOOTSTRAP_ON_REQUEST = os.getenv('SCHEMES_BOOTSTRAP_ON_REQUEST', 'True') == 'True'
+# Listing to scrape, concurrent page fetches and a cap on followed pager links
+SCHEMES_SOURCE_URL = os.getenv('SCHEMES_SOURCE_URL', 'https://www.india.gov.in/topics/agriculture')
+SCHEMES_SCRAPE_WORKERS = int(os.getenv('SCHEMES_SCRAPE_WORKERS', '4'))
+SCHEMES_MAX_PAGES = int(os.getenv('SCHEMES_MAX_PAGES', '50'))
\ No newline at end of file
@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kisan_saarthi.settings')
 
 application = get_wsgi_application()
+
+# Preload here rather than in ApiConfig.ready(): only serving processes import
+# this module, so management commands never load models. Under `gunicorn
+# --preload` it runs once in the master before the workers fork.
+from django.conf import settings  # noqa: E402
+
+if settings.ML_PRELOAD_MODELS:
+    from api.ml.warmup import preload_models
+
+    preload_models()
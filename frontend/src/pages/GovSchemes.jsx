@@ -24,9 +24,15 @@ import {
   ChevronRight
 } from "lucide-react"
 
+// Rows fetched per request while browsing or searching; more pages load on scroll
+const SCHEMES_PAGE_SIZE = 20
+
 const GovSchemes = () => {
   const [sidebarOpen, setSidebarOpen] = useState(false)
   const [schemes, setSchemes] = useState([])
+  const [totalSchemes, setTotalSchemes] = useState(0)
+  const [searchTotal, setSearchTotal] = useState(0)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filteredSchemes, setFilteredSchemes] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
@@ -37,25 +43,80 @@ const GovSchemes = () => {
   const [selectedScheme, setSelectedScheme] = useState(null)
   const [displayedSchemes, setDisplayedSchemes] = useState(10)
   const observerRef = useRef()
+  // Bumped when the first page reloads, so a late "load more" for the old filter or query is dropped
+  const pagingRef = useRef(0)
+
+  const activeCategory = selectedCategory && selectedCategory !== "All Categories" ? selectedCategory : ""
+
+  // One page of the stored catalog; X-Total-Count carries the unpaged total
+  const fetchSchemePage = async (page, category, signal) => {
+    const params = new URLSearchParams({ page: String(page), page_size: String(SCHEMES_PAGE_SIZE) })
+    if (category) params.set("category", category)
+    const response = await fetch(`http://127.0.0.1:8000/api/scrape-schemes/?${params}`, { signal })
+    if (!response.ok) throw new Error(`Schemes request failed (${response.status})`)
+    const data = await response.json()
+    return { rows: data, total: Number(response.headers.get("X-Total-Count") ?? data.length) }
+  }
+
+  // One page of ranked search results (handles Hindi keywords too); count is the unpaged total
+  const fetchSearchPage = async (page, query, category, signal) => {
+    const params = new URLSearchParams({ q: query, page: String(page), page_size: String(SCHEMES_PAGE_SIZE) })
+    if (category) params.set("category", category)
+    const response = await fetch(`http://127.0.0.1:8000/api/schemes/search/?${params}`, { signal })
+    if (!response.ok) throw new Error(`Scheme search failed (${response.status})`)
+    const data = await response.json()
+    return { rows: data.results || [], total: data.count ?? 0 }
+  }
 
+  // First page on mount and whenever the category filter changes (filtered server-side)
   useEffect(() => {
-  const fetchSchemes = async () => {
-    setLoading(true)
+    const controller = new AbortController()
+    pagingRef.current += 1
+    const loadFirstPage = async () => {
+      setLoading(true)
+      try {
+        const { rows, total } = await fetchSchemePage(1, activeCategory, controller.signal)
+        setSchemes(rows)
+        setTotalSchemes(total)
+        setDisplayedSchemes(10)
+        setError(null)
+      } catch (err) {
+        if (err.name !== "AbortError") setError("Failed to fetch government schemes. Please try again later.")
+      } finally {
+        if (!controller.signal.aborted) setLoading(false)
+      }
+    }
+
+    loadFirstPage()
+    return () => controller.abort()
+  }, [activeCategory])
+
+  // Next page of whichever list is showing: search results or the browsed catalog
+  const loadMoreSchemes = useCallback(async () => {
+    const query = searchTerm.trim()
+    const loaded = query ? filteredSchemes.length : schemes.length
+    const setRows = query ? setFilteredSchemes : setSchemes
+    const setTotal = query ? setSearchTotal : setTotalSchemes
+    if (loadingMore || loaded >= (query ? searchTotal : totalSchemes)) return
+    const generation = pagingRef.current
+    setLoadingMore(true)
     try {
-      const response = await fetch("http://127.0.0.1:8000/api/scrape-schemes/");
-      const data = await response.json();
-      setSchemes(data);
-      setFilteredSchemes(data);
-      setError(null);
+      const page = Math.floor(loaded / SCHEMES_PAGE_SIZE) + 1
+      const { rows, total } = query
+        ? await fetchSearchPage(page, query, activeCategory)
+        : await fetchSchemePage(page, activeCategory)
+      if (generation !== pagingRef.current) return
+      setRows(prev => [...prev, ...rows])
+      // An empty page means the results shrank since the first one; stop there
+      setTotal(rows.length ? total : loaded)
     } catch (err) {
-      setError("Failed to fetch government schemes. Please try again later.");
+      console.error(err)
+      // Don't let the scroll observer retry a failing page in a loop
+      if (generation === pagingRef.current) setTotal(loaded)
     } finally {
-      setLoading(false);
+      setLoadingMore(false)
     }
-  };
-
-  fetchSchemes();
-}, []);
+  }, [loadingMore, searchTerm, filteredSchemes.length, schemes.length, searchTotal, totalSchemes, activeCategory])
 
   // Animation variants
   const fadeInUp = {
@@ -184,60 +245,57 @@ const GovSchemes = () => {
     "West Bengal"
   ]
 
-  // Simulate API call
-  // useEffect(() => {
-  //   const fetchSchemes = async () => {
-  //     setLoading(true)
-  //     try {
-  //       // Simulate API delay
-  //       await new Promise(resolve => setTimeout(resolve, 1500))
-  //       setSchemes(mockSchemes)
-  //       setFilteredSchemes(mockSchemes)
-  //       setError(null)
-  //     } catch (err) {
-  //       setError("Failed to fetch government schemes. Please try again later.")
-  //     } finally {
-  //       setLoading(false)
-  //     }
-  //   }
-
-  //   fetchSchemes()
-  // }, [])
-
   // Filter schemes based on search and filters
   useEffect(() => {
-    let filtered = schemes
-
-    if (searchTerm) {
-      filtered = filtered.filter(scheme =>
-        scheme.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        scheme.shortDescription.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        scheme.department.toLowerCase().includes(searchTerm.toLowerCase())
-      )
+    const query = searchTerm.trim()
+    if (!query) {
+      setFilteredSchemes(schemes)
+      return
     }
 
-    if (selectedCategory && selectedCategory !== "All Categories") {
-      filtered = filtered.filter(scheme => scheme.category === selectedCategory)
-    }
+    // First page of ranked server-side results, debounced while typing; more load on scroll
+    const controller = new AbortController()
+    const timer = setTimeout(async () => {
+      try {
+        const { rows, total } = await fetchSearchPage(1, query, activeCategory, controller.signal)
+        // Drop any "load more" started against the previous results
+        pagingRef.current += 1
+        setFilteredSchemes(rows)
+        setSearchTotal(total)
+        setDisplayedSchemes(10)
+      } catch (err) {
+        if (err.name !== "AbortError") {
+          pagingRef.current += 1
+          setFilteredSchemes([])
+          setSearchTotal(0)
+        }
+      }
+    }, 300)
 
     // if (selectedState && selectedState !== "All States") {
     //   filtered = filtered.filter(scheme => scheme.state === selectedState)
     // }
 
-    setFilteredSchemes(filtered)
-  }, [schemes, searchTerm, selectedCategory])
+    return () => {
+      clearTimeout(timer)
+      controller.abort()
+    }
+  }, [schemes, searchTerm, activeCategory])
 
   // Infinite scroll functionality
   const lastSchemeElementRef = useCallback(node => {
     if (loading) return
     if (observerRef.current) observerRef.current.disconnect()
     observerRef.current = new IntersectionObserver(entries => {
-      if (entries[0].isIntersecting && displayedSchemes < filteredSchemes.length) {
+      if (!entries[0].isIntersecting) return
+      if (displayedSchemes < filteredSchemes.length) {
         setDisplayedSchemes(prev => Math.min(prev + 10, filteredSchemes.length))
+      } else {
+        loadMoreSchemes()
       }
     })
     if (node) observerRef.current.observe(node)
-  }, [loading, displayedSchemes, filteredSchemes.length])
+  }, [loading, displayedSchemes, filteredSchemes.length, loadMoreSchemes])
 
   const truncateText = (text, maxLength) => {
     if (text.length <= maxLength) return text
@@ -405,7 +463,7 @@ const GovSchemes = () => {
               </div>
               <div className="mt-4 md:mt-0 text-right">
                 <p className="text-emerald-100">Available Schemes</p>
-                <p className="text-2xl font-bold">{filteredSchemes.length}</p>
+                <p className="text-2xl font-bold">{searchTerm.trim() ? searchTotal : totalSchemes}</p>
               </div>
             </div>
           </motion.div>
@@ -581,7 +639,8 @@ const GovSchemes = () => {
           )}
 
           {/* Load More Indicator */}
-          {displayedSchemes < filteredSchemes.length && (
+          {(displayedSchemes < filteredSchemes.length ||
+            (searchTerm.trim() ? filteredSchemes.length < searchTotal : schemes.length < totalSchemes)) && (
             <div className="flex justify-center py-8">
               <Loader className="w-6 h-6 text-emerald-600 animate-spin" />
             </div>
@@ -142,7 +142,10 @@ const YieldPrediction = () => {
           yieldPerHa: data.yieldPerHa,
           quintalsPerHa: data.quintalsPerHa,
           totalYield: data.totalYield,
-          confidence: data.confidence || 90,
+          // null when the model has no per-tree spread (hgb backend)
+          confidence: data.confidence,
+          yieldLow: data.yieldLow,
+          yieldHigh: data.yieldHigh,
           cropName: formData.cropName,
           season: formData.season,
           year: formData.year,
@@ -398,18 +401,22 @@ const YieldPrediction = () => {
                         <h4 className="text-lg font-bold text-stone-800 mb-2">
                           {formatCropName(prediction.cropName)} - {prediction.season} {prediction.year}
                         </h4>
-                        <div className="flex items-center justify-center gap-2 mb-3">
-                          <CheckCircle className="w-5 h-5 text-emerald-600" />
-                          <span className="text-emerald-700 font-semibold">
-                            {prediction.confidence}% Confidence
-                          </span>
-                        </div>
-                        <div className="w-full bg-emerald-200 rounded-full h-2">
-                          <div 
-                            className="bg-gradient-to-r from-emerald-500 to-teal-500 h-2 rounded-full transition-all duration-1000" 
-                            style={{width: `${prediction.confidence}%`}}
-                          ></div>
-                        </div>
+                        {prediction.confidence != null && (
+                          <>
+                            <div className="flex items-center justify-center gap-2 mb-3">
+                              <CheckCircle className="w-5 h-5 text-emerald-600" />
+                              <span className="text-emerald-700 font-semibold">
+                                {prediction.confidence}% Confidence
+                              </span>
+                            </div>
+                            <div className="w-full bg-emerald-200 rounded-full h-2">
+                              <div 
+                                className="bg-gradient-to-r from-emerald-500 to-teal-500 h-2 rounded-full transition-all duration-1000" 
+                                style={{width: `${prediction.confidence}%`}}
+                              ></div>
+                            </div>
+                          </>
+                        )}
                       </div>
 
                       {/* Prediction Details - Compact for sidebar */}
@@ -422,6 +429,11 @@ const YieldPrediction = () => {
                           <div className="text-xs text-stone-500">
                             ({prediction.quintalsPerHa} quintals/ha)
                           </div>
+                          {prediction.yieldLow != null && prediction.yieldHigh != null && (
+                            <div className="text-xs text-stone-500">
+                              Likely range: {prediction.yieldLow} - {prediction.yieldHigh} kg/ha
+                            </div>
+                          )}
                         </div>
 
                         <div className="bg-white rounded-lg p-4 text-center shadow-md">